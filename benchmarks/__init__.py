@@ -0,0 +1,17 @@
+""" Headless performance benchmarks. Run them from the repo root, e.g.
+
+    python -m benchmarks.gravity
+    python -m benchmarks.suite --output results.json
+"""
+import os
+import sys
+
+# No window, no sound card needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS = os.path.join(ROOT, 'scripts')
+for path in (os.path.join(ROOT, 'src'), SCRIPTS, ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,57 @@
+""" Vectorized apply_gravity() against the per-body planet_gravity callback. """
+import argparse
+import math
+import random
+import time
+
+import pymunk
+
+import benchmarks  # noqa: F401  (puts src/ on the path)
+from physics import PhysicsEngine
+
+WORLD_SIZE = (1920, 1080)
+SIZES = [10, 100, 1_000, 10_000]
+
+
+def build_engine(count: int, vectorized: bool, seed: int = 0) -> PhysicsEngine:
+    """ Scatter count small circles in orbit around the center. They're all in
+    one collision group so we measure gravity, not the broadphase.
+    """
+    rng = random.Random(seed)
+    engine = PhysicsEngine(world_size=WORLD_SIZE, vectorized_gravity=vectorized)
+    no_contacts = pymunk.ShapeFilter(group=1)
+    for _ in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        radius = rng.uniform(100, 500)
+        position = (engine.GAME_CENTER.x + radius * math.cos(angle),
+                    engine.GAME_CENTER.y + radius * math.sin(angle))
+        shape = engine.create_circle(2, position)
+        shape.filter = no_contacts
+    return engine
+
+
+def time_steps(engine: PhysicsEngine, steps: int, dt: float) -> float:
+    """ Seconds per step, best of three runs. """
+    best = math.inf
+    for _ in range(3):
+        start = time.perf_counter()
+        engine.run(steps, dt)
+        best = min(best, (time.perf_counter() - start) / steps)
+    return best
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--steps', type=int, default=50)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    args = parser.parse_args(argv)
+
+    print(f'{"bodies":>8} {"callback ms":>12} {"vectorized ms":>14} {"speedup":>8}')
+    for count in args.sizes:
+        callback = time_steps(build_engine(count, vectorized=False), args.steps, 1 / 60)
+        vectorized = time_steps(build_engine(count, vectorized=True), args.steps, 1 / 60)
+        print(f'{count:>8} {callback * 1e3:>12.3f} {vectorized * 1e3:>14.3f} {callback / vectorized:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,355 @@
+""" Throughput benchmarks for physics, rasterizing, the HUD and whole frames.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --compare baseline.json --tolerance 0.15
+
+Each benchmark reports the per-call time in milliseconds (best and median of
+a few repeats). With --compare, any benchmark whose best time got slower than
+the baseline by more than the tolerance fails the run.
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from typing import Callable
+
+import benchmarks
+import pygame
+from pygame import Color
+
+from asset.geometry import ring_quads
+from asset.shape import BOX, CIRCLE, POLY, REG_POLY
+from physics import PhysicsEngine
+
+BENCHMARKS: dict[str, Callable[[], Callable[[], None]]] = {}
+
+
+def benchmark(name: str):
+    """ Registers a setup function. It builds whatever the benchmark needs and
+    returns the zero-argument callable that gets timed. If that has a close()
+    it's called once the timing is done.
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def measure(func: Callable[[], None], number: int, repeat: int) -> dict[str, float]:
+    func()  # warm up caches before timing anything
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number * 1e3)
+    return {'best_ms': min(timings), 'median_ms': statistics.median(timings), 'number': number}
+
+
+# ---------------------------------------------------------------- physics ---
+def build_world(rings: int, bodies: int) -> PhysicsEngine:
+    engine = PhysicsEngine(world_size=(1920, 1080))
+    for i in range(rings):
+        outer = 100 + 60 * i
+        engine.create_ring(ring_quads(3 + i % 6, outer - 50, outer), engine.GAME_CENTER, 0.2 * (i + 1))
+    for i in range(bodies):
+        angle = 2 * math.pi * i / max(bodies, 1)
+        radius = 60 + (i % 400)
+        engine.create_circle(3, (engine.GAME_CENTER.x + radius * math.cos(angle),
+                                 engine.GAME_CENTER.y + radius * math.sin(angle)))
+    return engine
+
+
+for _rings, _bodies in [(3, 1), (10, 100), (30, 1000)]:
+    @benchmark(f'physics.step_by[rings={_rings},bodies={_bodies}]')
+    def setup_physics(rings=_rings, bodies=_bodies):
+        engine = build_world(rings, bodies)
+        return lambda: engine.step_by(engine.timestep.dt)
+
+
+for _frozen in (0, 90):
+    @benchmark(f'physics.step_by[rings=60,frozen={_frozen}%]')
+    def setup_frozen(frozen=_frozen):
+        engine = build_world(60, 10)
+        for ring_body in engine.ring_bodies[:len(engine.ring_bodies) * frozen // 100]:
+            engine.freeze_ring(ring_body, math.inf)
+        return lambda: engine.step_by(engine.timestep.dt)
+
+
+# -------------------------------------------------------- threaded physics ---
+def get_frame_world():
+    """ A busy world, and the blits of a frame's worth of sprites to draw
+    while it steps.
+    """
+    engine = build_world(20, 300)
+    screen = pygame.Surface((1920, 1080))
+    sprite, _ = REG_POLY(6, 60).get_image_rect(Color('coral'))
+    blits = [(sprite, (i * 37 % 1860, i * 53 % 1020)) for i in range(400)]
+    return engine, screen, blits
+
+
+@benchmark('physics.frame[serial]')
+def setup_serial_frame():
+    engine, screen, blits = get_frame_world()
+
+    def frame():
+        engine.sync(engine.step_by(1 / 60))
+        screen.blits(blits, doreturn=False)
+    return frame
+
+
+@benchmark('physics.frame[threaded]')
+def setup_threaded_frame():
+    from physicsthread import PhysicsThread
+    engine, screen, blits = get_frame_world()
+    thread = PhysicsThread(engine)
+    thread.start()
+
+    def frame():
+        with thread.lock:
+            thread.advance_timers()
+        thread.sync()
+        screen.blits(blits, doreturn=False)
+    frame.close = thread.stop
+    return frame
+
+
+# ----------------------------------------------------------------- timers ---
+for _pending in (100, 10000):
+    @benchmark(f'timers.advance[pending={_pending}]')
+    def setup_timers(pending=_pending):
+        from scheduler import TimerScheduler
+        timers = TimerScheduler()
+        for i in range(pending):
+            timers.schedule(60 + i * 1e-3, None)
+
+        def frame():
+            # One timer fires, one is cancelled and one is started per step
+            timers.schedule(0, None)
+            timers.cancel(timers.schedule(30, None))
+            timers.advance(1 / 120)
+        return frame
+
+
+# ----------------------------------------------------------------- events ---
+@benchmark('events.dispatch[contacts=100]')
+def setup_events():
+    from events import EventBus, GameEvent
+    bus = EventBus()
+    hits = [0]
+
+    def on_hit(event):
+        hits[0] += 1
+    # One subscriber for every contact, like Ball, and one per enemy shape
+    bus.subscribe(GameEvent.COLLISION_BEGIN, on_hit)
+    for shape_id in range(50):
+        bus.subscribe(GameEvent.COLLISION_BEGIN, on_hit, key=shape_id)
+
+    def frame():
+        for shape_id in range(100):
+            bus.post(GameEvent.COLLISION_BEGIN, shape_id, 0, 1.0, 2.0)
+        bus.dispatch()
+    return frame
+
+
+# ----------------------------------------------------------------- shapes ---
+for _name, _shape in [('CIRCLE', CIRCLE(40)), ('REG_POLY', REG_POLY(7, 80)), ('BOX', BOX(200, 60, 5)),
+                      # A ring side, what RingStream draws
+                      ('POLY', POLY([tuple(vertex) for vertex in ring_quads(5, 150, 200)[0].tolist()]))]:
+    @benchmark(f'shape.get_image_rect[{_name}]')
+    def setup_shape(shape=_shape):
+        color = Color('coral')
+        return lambda: shape.get_image_rect(color)
+
+
+@benchmark('asset.construct[hud box]')
+def setup_construct():
+    from asset import Asset
+
+    def construct():
+        # Always a cache miss, like the first frame of a level
+        Asset.sprite_cache.clear()
+        Asset([], BOX(200, 60, 5), Color('gray20'), (100, 30), collides=False)
+    return construct
+
+
+for _indexed in (False, True):
+    @benchmark(f'asset.recolor[{"indexed" if _indexed else "rgb"}]')
+    def setup_recolor(indexed=_indexed):
+        from asset import Asset
+        asset = Asset([], CIRCLE(20), Color('white'), (0, 0), indexed=indexed)
+        counter = iter(range(sys.maxsize))
+
+        def recolor():
+            # A color nobody asked for yet, like a fresh gradient shade
+            asset.set_color(Color(next(counter) % 256, 128, 64))
+        return recolor
+
+
+def get_ring_side() -> POLY:
+    return POLY([tuple(vertex) for vertex in ring_quads(5, 150, 200)[0].tolist()])
+
+
+@benchmark('sprite.rotate[transform]')
+def setup_rotate_transform():
+    screen = pygame.Surface((800, 600))
+    image, _ = get_ring_side().get_image_rect(Color('coral'))
+    counter = iter(range(sys.maxsize))
+
+    def rotate():
+        rotated = pygame.transform.rotate(image, next(counter) % 360)
+        screen.blit(rotated, rotated.get_rect(center=(400, 300)))
+    return rotate
+
+
+@benchmark('sprite.rotate[cached]')
+def setup_rotate_cached():
+    from asset import Asset
+    screen = pygame.Surface((800, 600))
+    asset = Asset([], get_ring_side(), Color('coral'), (400, 300))
+    counter = iter(range(sys.maxsize))
+
+    def rotate():
+        asset.set_angle(math.radians(next(counter) % 360))
+        asset.draw(screen)
+    return rotate
+
+
+# ------------------------------------------------------------ game pieces ---
+_game = None
+
+
+def get_game():
+    """ One PolyBounce shared by all the benchmarks that need a game. """
+    global _game
+    if _game is None:
+        from polybounce import PolyBounce
+        # The game loads its data relative to scripts/ (contextlib.chdir is 3.11+)
+        cwd = os.getcwd()
+        os.chdir(benchmarks.SCRIPTS)
+        try:
+            with contextlib.redirect_stdout(None):
+                _game = PolyBounce()
+        finally:
+            os.chdir(cwd)
+    return _game
+
+
+@benchmark('hud.borderedbox.draw')
+def setup_box_draw():
+    game = get_game()
+    box = game.hud_matrix['Score']['label']
+    return lambda: box.draw(game.screen)
+
+
+@benchmark('hud.refresh')
+def setup_hud_refresh():
+    game = get_game()
+    counter = iter(range(sys.maxsize))
+
+    def refresh():
+        # A new value every call, so every box really has to redraw
+        value = str(next(counter))
+        for entry in game.hud_matrix.values():
+            entry['label'].set_text(value)
+    return refresh
+
+
+@benchmark('hud.compositor[unchanged]')
+def setup_hud_unchanged():
+    game = get_game()
+
+    def frame():
+        game.hud.update()
+        game.hud.draw(game.screen)
+    return frame
+
+
+@benchmark('hud.compositor[changed]')
+def setup_hud_changed():
+    game = get_game()
+    box = game.hud_matrix['Score']['label']
+    counter = iter(range(sys.maxsize))
+
+    def frame():
+        # One box changes every frame, like a ticking clock
+        box.set_text(str(next(counter)))
+        game.hud.update()
+        game.hud.draw(game.screen)
+    return frame
+
+
+@benchmark('ball.draw_slingshot')
+def setup_slingshot():
+    game = get_game()
+    return lambda: game.player.draw_slingshot(game.screen)
+
+
+@benchmark('polybounce.frame')
+def setup_frame():
+    game = get_game()
+    game.fps = 0  # don't let frame pacing into the numbers
+
+    def frame():
+        game.handle_user_input()
+        game.process_game_logic()
+        game.render()
+    return frame
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """ Names of benchmarks that got slower than baseline by over tolerance. """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['best_ms']
+        if before > 0 and (result['best_ms'] - before) / before > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to check the results against')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='allowed slowdown against the baseline, 0.10 is 10%%')
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this')
+    parser.add_argument('--number', type=int, default=50, help='calls per repeat')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        func = setup()
+        results[name] = measure(func, args.number, args.repeat)
+        if hasattr(func, 'close'):
+            func.close()
+        print(f'{name:<45} {results[name]["best_ms"]:>10.4f} ms  (median {results[name]["median_ms"]:.4f})')
+
+    if args.output:
+        with open(args.output, 'w') as results_file:
+            json.dump({'python': sys.version.split()[0],
+                       'pygame': pygame.version.ver,
+                       'results': results}, results_file, indent=4)
+
+    if args.compare:
+        with open(args.compare, 'r') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for name in regressions:
+            print(f'REGRESSION {name}: {baseline[name]["best_ms"]:.4f} ms -> {results[name]["best_ms"]:.4f} ms')
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+""" Aggregate steps per second of a VectorEnv against its number of worlds. """
+import argparse
+import json
+import time
+
+import numpy as np
+
+import benchmarks  # noqa: F401  (puts src/ and scripts/ on the path)
+from vectorenv import VectorEnv
+
+LEVELS_FILE = benchmarks.ROOT + '/data/level_diff.json'
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--level', default='Level 3')
+    parser.add_argument('--envs', type=int, nargs='+', default=[1, 10, 100, 500])
+    parser.add_argument('--steps', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    with open(LEVELS_FILE, 'r') as levels_file:
+        level = json.load(levels_file)[args.level]
+
+    print(f'{"envs":>6} {"env steps/s":>12} {"world steps/s":>14}')
+    for num_envs in args.envs:
+        env = VectorEnv(level, num_envs)
+        rng = np.random.default_rng(0)
+        actions = np.zeros((num_envs, 2))
+        actions[:, 0] = rng.uniform(0, 2 * np.pi, num_envs)
+        actions[:, 1] = 400
+        env.step(actions)
+        idle = np.zeros((num_envs, 2))
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            env.step(idle)
+        elapsed = time.perf_counter() - start
+        print(f'{num_envs:>6} {args.steps / elapsed:>12.1f} {args.steps * num_envs / elapsed:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
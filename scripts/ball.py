@@ -1,10 +1,13 @@
 from enum import Enum
+from typing import Optional
 
 import pygame
-from pygame import Surface, event
+from pygame import Surface, Rect
 
 from asset import Asset
 from asset.shape import CIRCLE
+from collision import EntityKind, split_collision_type
+from events import Event, GameEvent
 
 
 class Slingshot(Enum):
@@ -19,16 +22,31 @@ class Ball:
         self.asset = Asset([self.game.all_entities, self.game.player_group],
                            CIRCLE(10),
                            self.game.PALETTE['white'][0],
-                           self.game.CENTER)
+                           self.game.CENTER,
+                           indexed=True)
         self.level_score = 0
         self.total_score = 0
         self.moving = False
         self.freezes = 6
 
         self.slingshot = Slingshot.IDLE
-        self.slingshot_image = Surface(self.game.screen.get_size())
-        self.slingshot_image.set_colorkey([0, 0, 0])
-        self.slingshot_rect = self.slingshot_image.get_frect()
+        # Bounding rect of the line drawn last frame, None if nothing was drawn
+        self.slingshot_rect: Optional[Rect] = None
+        events = getattr(self.game, 'events', None)
+        if events is not None:
+            events.subscribe(GameEvent.COLLISION_BEGIN, self.on_hit)
+
+    def on_hit(self, event: Event) -> None:
+        """ Every side the ball hits is a point. """
+        if split_collision_type(event.value)[0] == EntityKind.SIDE:
+            self.level_score += 1
+            self.game.events.publish(GameEvent.SCORE_CHANGED, value=self.level_score)
+
+    def set_color(self, color: pygame.Color) -> None:
+        """ Take on the color of whatever the ball just hit. Only a palette
+        entry changes, nothing is drawn again.
+        """
+        self.asset.set_color(color)
 
     def get_freezes(self) -> int:
         return self.freezes
@@ -60,24 +78,27 @@ class Ball:
         else:
             self.slingshot = Slingshot.IDLE
 
-    def draw_slingshot(self, screen: Surface) -> None:
-        self.slingshot_image = Surface(self.game.screen.get_size())
-        self.slingshot_image.set_colorkey([0, 0, 0])
-        if self.slingshot.IDLE:
-            self.slingshot_rect = pygame.draw.line(self.slingshot_image,
-                                                   self.game.PALETTE['black'][5],
-                                                   pygame.mouse.get_pos(),
-                                                   self.asset.rect.center,
-                                                   round(self.asset.shape.get_width()))
-        elif self.slingshot.PULL_BACK:
-            self.slingshot_rect = pygame.draw.line(self.slingshot_image,
-                                                   self.game.PALETTE['red'][0],
-                                                   pygame.mouse.get_pos(),
+    def get_slingshot_color(self) -> Optional[pygame.Color]:
+        if self.slingshot == Slingshot.IDLE:
+            return self.game.PALETTE['black'][5]
+        if self.slingshot == Slingshot.PULL_BACK:
+            return self.game.PALETTE['red'][0]
+        return None
+
+    def draw_slingshot(self, screen: Surface) -> Optional[Rect]:
+        """ Draw the line between the mouse and the ball straight onto screen.
+        Returns the area it covered, or None when there's no line to draw.
+        """
+        color = self.get_slingshot_color()
+        if color is None:
+            self.slingshot_rect = None
+        else:
+            self.slingshot_rect = pygame.draw.line(screen,
+                                                   color,
+                                                   self.game.mouse_pos,
                                                    self.asset.rect.center,
                                                    round(self.asset.shape.get_width()))
-        self.slingshot_rect = self.slingshot_image.get_frect()
-        # self.slingshot_rect = self.slingshot_image.get_bounding_rect()
-        screen.blit(self.slingshot_image, self.slingshot_rect)
+        return self.slingshot_rect
 
     def toggle_moving(self) -> None:
         self.moving = False if self.moving else True
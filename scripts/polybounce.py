@@ -1,17 +1,58 @@
+import os
 import sys
+import math
+import argparse
 import random
 import json
+from contextlib import nullcontext
+from time import perf_counter_ns
+
+# Before the heavy imports below, so --profile-startup can count them
+STARTED = perf_counter_ns()
 
 import pygame
 from pygame import Surface, Color
 
+from asset.palette import Palette
 from ball import Ball, Slingshot
-from borderedbox import BorderedBox
+from borderedbox import BorderedBox, HUDCompositor
+from collision import EntityKind
+from events import EventBus, GameEvent
+from fonts import font_manager
 from physics import PhysicsEngine
+from profiler import FrameProfiler, StartupTimer, INPUT, SPRITES, HUD, PHYSICS, DRAW, FLIP, PACING
+from ring import RingStream
+
+IMPORTED = perf_counter_ns()
 
 class PolyBounce:
+    FREEZE_TIME = 5.0  # seconds a frozen ring stays still
+    LEVEL_TIME = 30.0  # seconds on each ring's clock
+
+    def __init__(self, dirty_rects: bool = False, profile: bool = False,
+                 profile_overlay: bool = False, profile_export: str = None,
+                 seed: int = None, record: str = None, replay: str = None,
+                 profile_startup: bool = False, threaded_physics: bool = False):
+        # None unless --profile-startup, reported once the first frame is up
+        self.startup = StartupTimer(STARTED) if profile_startup else None
+        if self.startup is not None:
+            self.startup.mark('imports', IMPORTED)
+
+        # Only imported for the features that need them
+        if record or replay:
+            from replay import InputRecorder, InputReplayer
+        # Replays bring their own seed, otherwise pick one so it can be recorded
+        self.replayer = InputReplayer(replay) if replay else None
+        if self.replayer is not None:
+            seed = self.replayer.seed
+        elif seed is None:
+            seed = random.randrange(2**63)
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.recorder = InputRecorder(record, seed) if record else None
+        self.frame = 0
+        self.mouse_pos = (0, 0)
 
-    def __init__(self):
         pygame.init()
         self.screen = pygame.display.set_mode([pygame.display.get_desktop_sizes()[0][0],
                                                pygame.display.get_desktop_sizes()[0][1]])
@@ -20,55 +61,81 @@ class PolyBounce:
         self.PALETTE = self.grab_palette('../data/palette.json')
         self.background = Surface([self.screen.get_size()[0], self.screen.get_size()[1]])
         self.background.fill(self.PALETTE['black'][0])
+        # Opt-in: only update the parts of the display that changed
+        self.renderer = None
+        if dirty_rects:
+            from renderer import DirtyRectRenderer
+            self.renderer = DirtyRectRenderer(self.screen, self.background)
+        if self.startup is not None:
+            self.startup.mark('display')
 
         self.clock = pygame.Clock()
         self.fps = 60
         self.running = False
         self.frame_start = 0.0
-        self.dt = 0.0
+        self.dt = 0.0  # seconds the last frame took
+        self.alpha = 0.0  # how far between physics steps to draw sprites
+        # None unless profiling, so the timing calls cost nothing otherwise
+        self.profiler = FrameProfiler() if profile or profile_overlay or profile_export else None
+        self.profile_overlay = profile_overlay
+        self.profile_export = profile_export
 
         self.all_entities = pygame.sprite.Group()
         self.HUD = pygame.sprite.Group()
         self.player_group = pygame.sprite.Group()
         self.enemy_group = pygame.sprite.Group()
 
-        PhysicsEngine.set_game(self)
+        # Collisions, freezes and score changes, delivered once per frame
+        self.events = EventBus()
+        self.physics = PhysicsEngine(game=self, events=self.events)
+        # Opt-in: step the physics on a worker thread while the frame draws.
+        # Touching the space from here then takes physics_lock.
+        self.physics_thread = None
+        self.physics_lock = nullcontext()
+        if threaded_physics:
+            from physicsthread import PhysicsThread
+            self.physics_thread = PhysicsThread(self.physics)
+            self.physics_lock = self.physics_thread.lock
         self.player = Ball(self)
+        self.ring_colors = [self.PALETTE[name][0] for name in self.get_shuffled_colors(len(self.PALETTE) - 3)]
+        self.physics.add_collision_handler(EntityKind.BALL, EntityKind.SIDE, len(self.ring_colors))
+        self.rings = RingStream(self.physics, self.ring_colors,
+                                groups=[self.all_entities, self.enemy_group],
+                                seed=self.random.randrange(2**32))
+        self.rings.update(self.player.asset.position)
+        if self.startup is not None:
+            self.startup.mark('world')
 
         self.font = self.load_font()
         self.unit_column = 0
         self.unit_row = 0
-        self.timers = {
-            'inner': [0],
-            'middle': [0],
-            'outer': [0]
-        }
+        # Countdowns on the simulation clock, see start_clock()
+        self.clocks = {name: self.physics.timers.schedule(self.LEVEL_TIME) for name in ('inner', 'middle', 'outer')}
         self.hud_matrix = {}
+        # Every label on one layer, only redrawn where a value changed
+        self.hud = HUDCompositor()
         self.load_HUD()
+        if self.startup is not None:
+            self.startup.mark('hud')
 
-    def grab_palette(self, json_filename: str) -> dict[str, Color]:
-        palette = {}
-        with open(json_filename, 'r') as palette_file:
-            palette = json.load(palette_file)
-        for key in palette.keys():
-            palette[key] = [Color(value) for value in palette[key]]
-        return palette
+    def grab_palette(self, json_filename: str) -> Palette:
+        return Palette.load(json_filename)
 
     def get_shuffled_colors(self, N: int) -> list[Color]:
         colors = list(self.PALETTE.keys())
         colors.remove('red')
         colors.remove('white')
         colors.remove('black')
-        random.shuffle(colors)
+        self.random.shuffle(colors)
 
-        return random.sample(colors, N)
+        return self.random.sample(colors, N)
 
     def get_gradients(self, N: int, color: str) -> list[Color]:
-        return random.sample([Color(self.PALETTE[color][i]) for i in range(N)], N)
+        """ N shades of color in random order, straight from its palette row. """
+        return self.random.sample(self.PALETTE.get_row(color, N), N)
 
     def load_font(self):
-        pygame.font.init()
-        return pygame.font.SysFont('monogram', 40)
+        return font_manager.get(40)
 
     def load_HUD(self) -> list[BorderedBox]:
         self.unit_column = self.screen.get_width() / 32
@@ -83,7 +150,8 @@ class PolyBounce:
                 'font-size': 60,
                 'bg-color': self.PALETTE['black'][1],
                 'font-color': self.PALETTE['white'][0],
-                'update-func': self.get_level
+                'update-func': self.get_level,
+                'refresh-on': [GameEvent.SCORE_CHANGED]  # redrawn on these events only, not polled
             },
             'Freezes Left': {
                 'width': 6,     # multiplied by the unit column width
@@ -94,7 +162,8 @@ class PolyBounce:
                 'font-size': 40,
                 'bg-color': self.PALETTE['black'][1],
                 'font-color': self.PALETTE['aqua'][0],
-                'update-func': self.get_freezes_left
+                'update-func': self.get_freezes_left,
+                'refresh-on': [GameEvent.RING_FROZEN]
             },
             'Inner Clock': {
                 'width': 6,     # multiplied by the unit column width
@@ -138,7 +207,8 @@ class PolyBounce:
                 'font-size': 40,
                 'bg-color': self.PALETTE['black'][1],
                 'font-color': self.PALETTE['white'][0],
-                'update-func': self.player.get_score
+                'update-func': self.player.get_score,
+                'refresh-on': [GameEvent.SCORE_CHANGED]
             }
         }
         for key in list(self.hud_matrix.keys()):
@@ -151,8 +221,12 @@ class PolyBounce:
                                 height=(self.hud_matrix[key]['height'] * self.unit_row)-10,
                                 border=self.hud_matrix[key]['border-width'],
                                 position=(self.hud_matrix[key]['position'][0] * self.unit_column,
-                                          self.hud_matrix[key]['position'][1] * self.unit_row))
-            label.draw(self.screen)
+                                          self.hud_matrix[key]['position'][1] * self.unit_row),
+                                groups=[])
+            refresh_on = self.hud_matrix[key].get('refresh-on')
+            self.hud.add(label, self.hud_matrix[key]['update-func'], poll=refresh_on is None)
+            for event_type in refresh_on or []:
+                self.events.subscribe(event_type, lambda event, label=label: self.hud.refresh(label))
             self.hud_matrix[key]['label'] = label
 
     def get_level(self) -> str:
@@ -161,41 +235,105 @@ class PolyBounce:
     def get_freezes_left(self) -> str:
         return str(self.player.get_freezes())
 
-    def start_inner_clock(self) -> str:
-        self.timers['inner'].append((pygame.time.get_ticks()//1000)+30)
+    def start_clock(self, name: str, duration: float = None) -> None:
+        """ Start (or restart) the 'inner', 'middle' or 'outer' countdown. """
+        self.physics.timers.reschedule(self.clocks[name], self.LEVEL_TIME if duration is None else duration)
+
+    def get_clock(self, name: str) -> str:
+        return str(math.ceil(self.physics.timers.get_remaining(self.clocks[name]))) + 's'
 
     def get_inner_clock(self) -> str:
-        return str(self.timers['inner'][0]-(pygame.time.get_ticks()//1000)) + 's'
+        return self.get_clock('inner')
 
     def get_middle_clock(self) -> str:
-        return str(30-(pygame.time.get_ticks()//1000)) + 's'
+        return self.get_clock('middle')
 
     def get_outer_clock(self) -> str:
-        return str(30-(pygame.time.get_ticks()//1000)) + 's'
+        return self.get_clock('outer')
 
     def start(self) -> None:
         self.running = True
+        if self.physics_thread is not None:
+            self.physics_thread.start()
         self.main_loop()
 
     def main_loop(self) -> None:
         while self.running:
             self.frame_start = pygame.time.get_ticks()
+            if self.profiler is not None:
+                self.profiler.begin_frame()
             self.handle_user_input()
+            if self.profiler is not None:
+                self.profiler.lap(INPUT)
             self.process_game_logic()
             self.render()
+            if self.profiler is not None:
+                self.profiler.end_frame()
+            if self.startup is not None and self.frame == 0:
+                self.startup.mark('first frame')
+                print(json.dumps(self.startup.report(), indent=4))
+            self.frame += 1
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.profiler is not None:
+            print(json.dumps(self.profiler.report(), indent=4))
+            if self.profile_export:
+                self.profiler.export(self.profile_export)
+        self.quit()
+
+    def quit(self) -> None:
+        """ Shut pygame down. The shared font and text caches go too, their
+        Fonts die with the font module and a later PolyBounce needs new ones.
+        """
+        if self.physics_thread is not None:
+            self.physics_thread.stop()
+        font_manager.clear()
+        BorderedBox.text_cache.clear()
         pygame.quit()
 
+    def get_events(self) -> list[pygame.event.Event]:
+        """ This frame's input, live or from the replay log. Also records it
+        when recording.
+        """
+        if self.replayer is not None:
+            pygame.event.pump()
+            if self.replayer.is_finished(self.frame):
+                self.running = False
+            self.dt = self.replayer.get_dt(self.frame)
+            events = self.replayer.get_events(self.frame)
+        else:
+            events = pygame.event.get()
+        if self.recorder is not None:
+            self.recorder.record_frame(self.frame, self.dt)
+            for event in events:
+                self.recorder.record_event(self.frame, event)
+        return events
+
+    def freeze_next_ring(self) -> None:
+        """ Spends one of the player's freezes on the ring the ball has to get
+        through next. The physics engine thaws it after FREEZE_TIME.
+        """
+        if self.player.freezes <= 0:
+            return
+        ring = self.rings.get_next_ring(self.player.asset.position)
+        if ring is None or self.physics.is_frozen(ring.body):
+            return
+        with self.physics_lock:
+            self.physics.freeze_ring(ring.body, self.FREEZE_TIME)
+        self.player.freezes -= 1
+        self.events.publish(GameEvent.RING_FROZEN, ring.body)
+
     def handle_user_input(self) -> None:
-        for event in pygame.event.get():
+        for event in self.get_events():
+            if event.type == pygame.MOUSEMOTION:
+                self.mouse_pos = event.pos
             if event.type == pygame.QUIT:
                 self.running = False
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
                 if event.key == pygame.K_f:
-                    print('FREEZE selected ring')
-                    print('START its timer till unfreeze')
-                    print('REDUCE player number of freezes left to use')
+                    self.freeze_next_ring()
                 if event.key == pygame.K_SPACE:
                     self.player.toggle_moving()
 
@@ -208,24 +346,107 @@ class PolyBounce:
                 self.player.toggle_moving()
 
     def process_game_logic(self) -> None:
-        """ Retrieve the position data from the PhysicsEngine. """
-        self.dt = pygame.time.get_ticks() - self.frame_start
+        """ Step the physics at its fixed rate (or catch up with the physics
+        thread), then retrieve the position data from the PhysicsEngine.
+        """
+        if self.physics_thread is None:
+            self.alpha = self.physics.step_by(self.dt)
+            self.events.dispatch()
+            if self.profiler is not None:
+                self.profiler.lap(PHYSICS)
+            self.physics.sync(self.alpha)
+            self.rings.update(self.player.asset.position)
+            self.rings.sync(self.alpha)
+        else:
+            # The worker has been stepping all along, catch up with it
+            with self.physics_lock:
+                self.physics_thread.advance_timers()
+                self.events.dispatch()
+                self.rings.update(self.player.asset.position)
+            if self.profiler is not None:
+                self.profiler.lap(PHYSICS)
+            rows, states = self.physics_thread.sync()
+            self.rings.sync(rows=rows, states=states)
         self.all_entities.update(self.dt)
-        for key in list(self.hud_matrix.keys()):
-            if self.hud_matrix[key]['update-func'] != None:
-                self.hud_matrix[key]['label'].set_text(str(self.hud_matrix[key]['update-func']()))
+        if self.profiler is not None:
+            self.profiler.lap(SPRITES)
+        self.hud.update()
+        if self.profiler is not None:
+            self.profiler.lap(HUD)
 
     def render(self):
-        self.screen.blit(self.background, [0, 0])
-        self.player.draw(self.screen)
-        # self.screen.subsurface()
-        self.all_entities.draw(self.screen)
+        if self.renderer is not None:
+            self.render_dirty()
+        else:
+            self.screen.blit(self.background, [0, 0])
+            self.player.draw(self.screen)
+            # self.screen.subsurface()
+            self.all_entities.draw(self.screen)
+            self.hud.draw(self.screen)
+            if self.profile_overlay:
+                self.profiler.draw_overlay(self.screen, self.font)
+            if self.profiler is not None:
+                self.profiler.lap(DRAW)
+
+            pygame.display.flip()
+        if self.profiler is not None:
+            self.profiler.lap(FLIP)
+        if self.replayer is not None:
+            # As fast as it'll go, the recorded dt is used next frame anyway
+            self.clock.tick()
+        elif self.physics_thread is not None:
+            # Sleep rather than spin, the physics thread wants the CPU
+            self.dt = self.clock.tick(self.fps) / 1000
+        else:
+            self.dt = self.clock.tick_busy_loop(self.fps) / 1000
+        if self.profiler is not None:
+            self.profiler.lap(PACING)
 
-        self.clock.tick_busy_loop(self.fps)
-        PhysicsEngine.step_by(self.dt)
-        pygame.display.flip()
+    def render_dirty(self):
+        self.renderer.erase()
+        self.player.draw(self.screen)
+        self.renderer.mark('slingshot', self.player.slingshot_rect)
+        self.renderer.draw_group(self.all_entities)
+        self.renderer.draw_layer('hud', self.hud.areas, self.hud.changed)
+        if self.profile_overlay:
+            self.renderer.mark('profiler', self.profiler.draw_overlay(self.screen, self.font))
+        if self.profiler is not None:
+            self.profiler.lap(DRAW)
+        self.renderer.present()
 
 
 if __name__ == "__main__":
-    PolyBounce().start()
+    parser = argparse.ArgumentParser(description='PolyBounce')
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help='only update the changed parts of the display each frame')
+    parser.add_argument('--profile', action='store_true',
+                        help='time every phase of the frame and print p50/p95/p99 on exit')
+    parser.add_argument('--profile-overlay', action='store_true',
+                        help='show the frame phase timings on screen')
+    parser.add_argument('--profile-export', metavar='FILE',
+                        help='write the frame timings to a .csv or .json file on exit')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='print how long each phase of startup took, up to the first frame')
+    parser.add_argument('--seed', type=int, help='seed the ring colors')
+    parser.add_argument('--record', metavar='FILE', help='record the seed and all input to FILE')
+    parser.add_argument('--replay', metavar='FILE', help='play back a recorded session at full speed')
+    parser.add_argument('--threaded-physics', action='store_true',
+                        help='step the physics on its own thread (not with --record or --replay)')
+    parser.add_argument('--headless', action='store_true', help="don't open a window (SDL dummy driver)")
+    args = parser.parse_args()
+    if args.seed is not None and not 0 <= args.seed < 2**64:
+        parser.error('--seed has to be between 0 and 2**64 - 1, it is recorded as an unsigned 64-bit int')
+    if args.threaded_physics and (args.record or args.replay):
+        parser.error("threaded physics isn't deterministic, it can't be recorded or replayed")
+    if args.headless:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    PolyBounce(dirty_rects=args.dirty_rects,
+               profile=args.profile,
+               profile_overlay=args.profile_overlay,
+               profile_export=args.profile_export,
+               seed=args.seed,
+               record=args.record,
+               replay=args.replay,
+               profile_startup=args.profile_startup,
+               threaded_physics=args.threaded_physics).start()
     sys.exit()
@@ -1,6 +1,18 @@
+import math
+import random
+from collections import defaultdict
 from enum import Enum
+from typing import Optional
 
-from asset.shape import Shape, REG_POLY
+import numpy as np
+import pymunk
+from pygame import Color
+
+from asset import Asset
+from asset.shape import POLY
+from asset.geometry import ring_quads
+from events import GameEvent
+from scheduler import Timer
 
 WALL_THICKNESS = 50
 
@@ -18,14 +30,191 @@ class RingFactory:
         self.base_colors = self.game.get_shuffled_colors(self.N)
         self.colors = self.game.get_gradients(self.base_colors, self.N)
 
-    def create_ring(self, size: str, angular_velocity: float) -> list[pymunk.Shape]:
+    def get_side_quads(self, size: RING_SIZE, center: tuple[float, float] = (0, 0)) -> np.ndarray:
+        """ All N sides of the ring as one (N, 4, 2) array of
+        (inner_start, OUTER_start, OUTER_END, inner_END) quads.
+        """
         outer_radius = RING_SIZE(size).value
         inner_radius = RING_SIZE(size).value - WALL_THICKNESS
+        return ring_quads(self.N, inner_radius, outer_radius, center)
+
+    def create_ring(self, size: RING_SIZE, angular_velocity: float) -> tuple[pymunk.Body, list[pymunk.Shape]]:
+        return self.game.physics.create_ring(self.get_side_quads(size),
+                                             self.game.CENTER,
+                                             angular_velocity)
+
+
+class Ring:
+    """ One live ring of the RingStream: its body, side shapes, side sprites
+    and the palette index of each side.
+
+    Every side sprite is the same quad (side 0's) turned by base_angles[i], so
+    all the sides share their pre-rotated frames. pivots[i] is the middle of
+    side i's sprite in body coordinates.
+    """
+
+    def __init__(self, index: int, body: pymunk.Body, sides: list[pymunk.Shape],
+                 assets: list[Asset], color_indices: list[int],
+                 pivots: list[pymunk.Vec2d] = (), base_angles: list[float] = ()):
+        self.index = index
+        self.body = body
+        self.sides = sides
+        self.assets = assets
+        self.color_indices = color_indices
+        self.pivots = pivots
+        self.base_angles = base_angles
+        # Sides waiting to break off, cancelled if the ring is culled first
+        self.pending: list[Timer] = []
+
+
+class RingStream:
+    """ The (seemingly) infinite set of rings, built lazily around the ball.
+
+    Ring k has an outer radius of INNER + k * WALL_THICKNESS, so the rings sit
+    wall to wall. update() keeps the rings from behind rings inside the ball
+    to ahead rings outside it alive, and culls the rest. Culled rings give
+    their body, side shapes and side sprites back to pools, and new rings
+    take from the pools first, so however far out the player gets the number
+    of live objects (and the cost of a step) stays the same.
+    """
+
+    def __init__(self, physics, colors: list[Color], groups=None, seed: Optional[int] = None,
+                 min_sides: int = 3, max_sides: int = 8, ahead: int = 3, behind: int = 1,
+                 speed: float = 10):
+        self.physics = physics
+        self.colors = colors
+        self.groups = groups  # None means headless, no sprites at all
+        self.random = random.Random(seed)
+        self.min_sides = min_sides
+        self.max_sides = max_sides
+        self.ahead = ahead
+        self.behind = behind
+        self.speed = speed  # degrees per second, the direction alternates per ring
+
+        self.rings: dict[int, Ring] = {}
+        self.body_pool: dict[int, list[tuple[pymunk.Body, list[pymunk.Shape]]]] = defaultdict(list)
+        self.asset_pool: list[Asset] = []
+        self.created = 0
+        self.reused = 0
+
+    @staticmethod
+    def get_outer_radius(index: int) -> float:
+        return RING_SIZE.INNER.value + index * WALL_THICKNESS
+
+    def get_band(self, distance: float) -> range:
+        """ Indices of the rings that should be alive with the ball distance
+        from the center.
+        """
+        passed = 0
+        if distance >= RING_SIZE.INNER.value:
+            passed = int((distance - RING_SIZE.INNER.value) // WALL_THICKNESS) + 1
+        return range(max(passed - self.behind, 0), passed + self.ahead)
+
+    def update(self, ball_position: tuple[float, float]) -> None:
+        distance = pymunk.Vec2d(*ball_position).get_distance(self.physics.GAME_CENTER)
+        band = self.get_band(distance)
+        for index in [index for index in self.rings if index not in band]:
+            self.cull(index)
+        for index in band:
+            if index not in self.rings:
+                self.spawn(index)
+
+    def get_next_ring(self, ball_position: tuple[float, float]) -> Optional[Ring]:
+        """ The innermost live ring the ball is still inside of. """
+        distance = pymunk.Vec2d(*ball_position).get_distance(self.physics.GAME_CENTER)
+        for index in sorted(self.rings):
+            if self.get_outer_radius(index) > distance:
+                return self.rings[index]
+        return None
+
+    def spawn(self, index: int) -> Ring:
+        N = self.random.randint(self.min_sides, self.max_sides)
+        outer_radius = self.get_outer_radius(index)
+        quads = ring_quads(N, outer_radius - WALL_THICKNESS, outer_radius)
+        color_indices = [self.random.randrange(len(self.colors)) for _ in range(N)]
+        angular_velocity = math.radians(self.speed) * (1 if index % 2 == 0 else -1)
+
+        if self.body_pool[N]:
+            body, sides = self.body_pool[N].pop()
+            self.physics.rebuild_ring(body, sides, quads, self.physics.GAME_CENTER,
+                                      angular_velocity, color_indices)
+            self.reused += 1
+        else:
+            body, sides = self.physics.create_ring(quads, self.physics.GAME_CENTER,
+                                                   angular_velocity, color_indices)
+            self.created += 1
+
+        assets = []
+        pivots = []
+        base_angles = []
+        if self.groups is not None:
+            shape = POLY([tuple(vertex) for vertex in quads[0].tolist()])
+            pivot = pymunk.Vec2d(*((quads[0].min(axis=0) + quads[0].max(axis=0)) / 2))
+            for i, color_index in enumerate(color_indices):
+                base_angles.append(2 * math.pi * i / N)
+                pivots.append(pivot.rotated(base_angles[i]))
+                color = self.colors[color_index]
+                position = tuple(body.local_to_world(pivots[i]))
+                if self.asset_pool:
+                    asset = self.asset_pool.pop()
+                    asset.position = list(position)
+                    asset.set_shape(shape, color)
+                    asset.add(self.groups)
+                else:
+                    asset = Asset(self.groups, shape, color, position)
+                # Builds the rotated frames now rather than mid-game
+                asset.set_angle(body.angle + base_angles[i])
+                assets.append(asset)
+
+        ring = Ring(index, body, sides, assets, color_indices, pivots, base_angles)
+        self.rings[index] = ring
+        return ring
+
+    def cull(self, index: int) -> None:
+        ring = self.rings.pop(index)
+        for timer in ring.pending:
+            self.physics.timers.cancel(timer)
+        self.physics.remove_ring(ring.body)
+        self.body_pool[len(ring.sides)].append((ring.body, ring.sides))
+        for asset in ring.assets:
+            asset.kill()
+            self.asset_pool.append(asset)
+
+    def remove_side(self, side: pymunk.Shape, delay: float = 0) -> None:
+        """ Break a side off whichever live ring it belongs to, now or delay
+        simulated seconds from now.
+        """
+        for ring in self.rings.values():
+            if side in ring.sides:
+                if delay > 0:
+                    ring.pending.append(self.physics.timers.schedule(delay, self.break_side, ring, side))
+                else:
+                    self.break_side(ring, side)
+                return
 
-        outer_points = REG_POLY(self.N, outer_radius).get_vertices()
-        inner_points = REG_POLY(self.N, inner_radius).get_vertices()
+    def break_side(self, ring: Ring, side: pymunk.Shape) -> None:
+        if self.physics.events is not None:
+            self.physics.events.post(GameEvent.SIDE_BROKEN, self.physics.shape_ids.get(side, -1))
+        self.physics.remove_side_later(side)
+        if ring.assets:
+            ring.assets[ring.sides.index(side)].kill()
 
-        # Splitting and regrouping vertices into (inner_start, OUTER_start, OUTER_END, inner_END)
-        for i in range(self.N):
-            # self.base_colors[i]
-            pass
+    def sync(self, alpha: float = 1.0, rows: Optional[dict[pymunk.Body, int]] = None,
+             states: Optional[list[list[float]]] = None) -> None:
+        """ Move and turn the side sprites to where their sides are alpha of
+        the way through the last step (see PhysicsEngine.interpolate()), or
+        to the [x, y, angle] states[rows[body]] of a PhysicsThread snapshot.
+        """
+        for ring in self.rings.values():
+            if rows is None:
+                origin, angle = self.physics.interpolate(ring.body, alpha)
+            else:
+                row = rows.get(ring.body)
+                if row is None:
+                    continue  # (re)spawned since the last step, still where spawn() put it
+                x, y, angle = states[row]
+                origin = pymunk.Vec2d(x, y)
+            for asset, pivot, base_angle in zip(ring.assets, ring.pivots, ring.base_angles):
+                position = origin + pivot.rotated(angle)
+                asset.position = [position.x, position.y]
+                asset.set_angle(angle + base_angle)
@@ -0,0 +1,180 @@
+""" A level from level_diff.json played out headless: rings, a ball and a
+scripted launch strategy, with no game, window or sprites involved.
+"""
+import math
+import random
+from typing import Callable, Optional
+
+import pymunk
+
+from asset.geometry import ring_quads
+from collision import CollisionPhase, EntityKind
+from physics import PhysicsEngine
+from ring import RING_SIZE, WALL_THICKNESS
+
+BALL_RADIUS = 10
+LAUNCH_SPEED = 400
+COLORS = 6  # palette colors rings are painted with (everything but red/white/black)
+DEFAULT_HITS = 1
+DEFAULT_SPEED = 10  # degrees per second
+
+
+def aim_at_matching_side(simulation: 'LevelSimulation') -> tuple[float, float]:
+    """ Launch straight at the middle of the nearest side sharing the ball's
+    color. Returns (angle, speed).
+    """
+    ball_position = simulation.ball.body.position
+    best = None
+    for side, color_index in simulation.side_colors.items():
+        if color_index != simulation.ball_color or side.space is None:
+            continue
+        target = side.body.local_to_world(side.center_of_gravity)
+        distance = ball_position.get_dist_sqrd(target)
+        if best is None or distance < best[0]:
+            best = (distance, target)
+    if best is None:
+        # Nothing left in our color, head straight out
+        offset = ball_position - simulation.engine.GAME_CENTER
+        return math.atan2(offset.y, offset.x) if offset.length else 0.0, LAUNCH_SPEED
+    offset = best[1] - ball_position
+    return math.atan2(offset.y, offset.x), LAUNCH_SPEED
+
+
+class LevelSimulation:
+    """ One run of one level. The ball starts in the middle, every side takes
+    Hits matching-color hits to break, and the level is cleared when the ball
+    gets out past the outer ring.
+    """
+
+    def __init__(self, level: dict, seed: int = 0, step_rate: float = 120,
+                 strategy: Callable[['LevelSimulation'], tuple[float, float]] = aim_at_matching_side,
+                 engine: Optional[PhysicsEngine] = None,
+                 auto_launch: bool = True):
+        self.random = random.Random(seed)
+        self.strategy = strategy
+        # Off when something else (like a VectorEnv) decides the launches
+        self.auto_launch = auto_launch
+        self.engine = engine or PhysicsEngine(world_size=(1000, 1000), step_rate=step_rate)
+        self.engine.add_collision_handler(EntityKind.BALL, EntityKind.SIDE, COLORS)
+        self.dt = self.engine.timestep.dt
+
+        self.sides: list[pymunk.Shape] = []  # every side ever built, broken or not
+        self.side_colors: dict[pymunk.Shape, int] = {}
+        self.side_rings: dict[pymunk.Shape, int] = {}
+        self.hits_left: dict[pymunk.Shape, int] = {}
+        self.ring_bodies: list[pymunk.Body] = []
+        ring_sizes = list(RING_SIZE)
+        rings = level['Rings']
+        hits = level.get('Hits', [DEFAULT_HITS] * len(rings))
+        speeds = level.get('Speeds', [DEFAULT_SPEED] * len(rings))
+        for i, sides in enumerate(rings):
+            # Rings past OUTER keep going out a wall thickness at a time
+            outer_radius = (ring_sizes[i].value if i < len(ring_sizes)
+                            else ring_sizes[-1].value + WALL_THICKNESS * (i - len(ring_sizes) + 1))
+            colors = [self.random.randrange(COLORS) for _ in range(sides)]
+            direction = 1 if i % 2 == 0 else -1
+            ring_body, shapes = self.engine.create_ring(ring_quads(sides, outer_radius - WALL_THICKNESS, outer_radius),
+                                                        self.engine.GAME_CENTER,
+                                                        direction * math.radians(speeds[i]),
+                                                        colors)
+            self.ring_bodies.append(ring_body)
+            self.sides.extend(shapes)
+            for shape, color_index in zip(shapes, colors):
+                self.side_colors[shape] = color_index
+                self.side_rings[shape] = i
+                self.hits_left[shape] = hits[i]
+        self.escape_radius = outer_radius + BALL_RADIUS * 2
+
+        self.ball_color = self.pick_ball_color()
+        mass = 1
+        ball_body = pymunk.Body(mass, pymunk.moment_for_circle(mass, 0, BALL_RADIUS))
+        ball_body.position = self.engine.GAME_CENTER
+        self.ball = pymunk.Circle(ball_body, BALL_RADIUS)
+        self.ball.elasticity = 1
+        self.ball.friction = 0
+        self.engine.register_shape(self.ball, EntityKind.BALL, self.ball_color)
+        self.engine.space.add(ball_body, self.ball)
+        self.ball_id = self.engine.shape_ids[self.ball]
+
+        self.steps = 0
+        self.contacts = 0
+        self.hits = 0
+        self.launches = 0
+        self.cleared_at: Optional[float] = None
+
+    @property
+    def time(self) -> float:
+        return self.steps * self.dt
+
+    @property
+    def cleared(self) -> bool:
+        return self.cleared_at is not None
+
+    def pick_ball_color(self) -> int:
+        """ A color from the innermost ring that still has sides, the only
+        ring the ball can actually reach.
+        """
+        innermost = min(self.side_rings[side] for side in self.side_colors)
+        return self.random.choice([color_index for side, color_index in self.side_colors.items()
+                                   if self.side_rings[side] == innermost])
+
+    def launch(self, angle: Optional[float] = None, speed: Optional[float] = None) -> None:
+        """ Fire the ball, at (angle, speed) or wherever the strategy says. """
+        if angle is None:
+            angle, speed = self.strategy(self)
+        self.ball.body.velocity = (speed * math.cos(angle), speed * math.sin(angle))
+        self.launches += 1
+
+    def count_contact(self, arbiter: pymunk.Arbiter) -> None:
+        self.contacts += 1
+
+    def step(self) -> None:
+        self.engine.step(self.dt)
+        self.steps += 1
+        self.ball.body.each_arbiter(self.count_contact)
+
+        relaunch = False
+        for event in self.engine.drain_collisions():
+            if event['phase'] != CollisionPhase.BEGIN:
+                continue
+            side = self.engine.get_shape(event['shape_b'] if event['shape_a'] == self.ball_id else event['shape_a'])
+            self.hits += 1
+            self.hits_left[side] -= 1
+            if self.hits_left[side] <= 0:
+                self.engine.remove_side_later(side)
+                del self.side_colors[side]
+            relaunch = True
+        if relaunch and self.side_colors:
+            self.ball_color = self.pick_ball_color()
+            self.engine.set_color(self.ball, self.ball_color)
+            if self.auto_launch:
+                self.launch()
+
+        if self.ball.body.position.get_distance(self.engine.GAME_CENTER) > self.escape_radius:
+            self.cleared_at = self.time
+
+    def run(self, max_time: float = 60, relaunch_every: float = 2.0) -> dict[str, float]:
+        """ Play until cleared or max_time simulated seconds. The strategy gets
+        to relaunch every relaunch_every seconds without a hit too, so the ball
+        can't rattle around forever.
+        """
+        self.launch()
+        last_launch = self.launches
+        next_relaunch = relaunch_every
+        while not self.cleared and self.time < max_time:
+            self.step()
+            if self.launches != last_launch:
+                last_launch = self.launches
+                next_relaunch = self.time + relaunch_every
+            elif self.time >= next_relaunch:
+                self.launch()
+        return self.get_metrics()
+
+    def get_metrics(self) -> dict[str, float]:
+        return {'cleared': self.cleared,
+                'time_to_clear': self.cleared_at,
+                'sim_time': self.time,
+                'steps': self.steps,
+                'contacts_per_step': self.contacts / self.steps if self.steps else 0.0,
+                'hits': self.hits,
+                'launches': self.launches}
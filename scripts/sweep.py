@@ -0,0 +1,85 @@
+""" Plays every level in level_diff.json many times over, spread across all
+the cores, and reports how playable and how expensive each one is.
+
+    python sweep.py --runs 200 --output sweep.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from simulation import LevelSimulation
+
+LEVELS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'level_diff.json')
+
+
+def run_level(level_name: str, level: dict, seed: int, max_time: float) -> dict:
+    """ One simulated run, in whichever worker process picks it up. Each run
+    builds its own PhysicsEngine, so nothing is shared between runs.
+    """
+    start = time.perf_counter()
+    metrics = LevelSimulation(level, seed=seed).run(max_time)
+    elapsed = time.perf_counter() - start
+    metrics['level'] = level_name
+    metrics['seed'] = seed
+    metrics['steps_per_second'] = metrics['steps'] / elapsed if elapsed else 0.0
+    # High-water mark of the worker process, Linux reports KiB and macOS bytes
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    metrics['max_rss_mb'] = max_rss / 1024 ** (2 if sys.platform == 'darwin' else 1)
+    return metrics
+
+
+def summarize(runs: list[dict]) -> dict:
+    cleared = [run['time_to_clear'] for run in runs if run['cleared']]
+    return {
+        'runs': len(runs),
+        'cleared_fraction': len(cleared) / len(runs),
+        'time_to_clear_median': statistics.median(cleared) if cleared else None,
+        'time_to_clear_max': max(cleared) if cleared else None,
+        'steps_per_second_mean': statistics.fmean(run['steps_per_second'] for run in runs),
+        'contacts_per_step_mean': statistics.fmean(run['contacts_per_step'] for run in runs),
+        'hits_mean': statistics.fmean(run['hits'] for run in runs),
+        'max_rss_mb': max(run['max_rss_mb'] for run in runs),
+    }
+
+
+def sweep(levels: dict, runs: int, max_time: float, workers: int = None, seed: int = 0) -> dict:
+    tasks = [(name, level, seed + i, max_time) for name, level in levels.items() for i in range(runs)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run_level, *zip(*tasks), chunksize=max(1, len(tasks) // 64)))
+    wall_time = time.perf_counter() - start
+
+    by_level = {name: [] for name in levels}
+    for result in results:
+        by_level[result['level']].append(result)
+    return {'wall_time': wall_time,
+            'workers': workers or os.cpu_count(),
+            'levels': {name: summarize(level_runs) for name, level_runs in by_level.items()}}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--levels', default=LEVELS_FILE, help='level table to sweep')
+    parser.add_argument('--runs', type=int, default=50, help='simulated runs per level')
+    parser.add_argument('--max-time', type=float, default=60, help='simulated seconds before giving up on a run')
+    parser.add_argument('--workers', type=int, help='worker processes, defaults to one per core')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first run, the rest count up from it')
+    parser.add_argument('--output', help='write the report to this JSON file')
+    args = parser.parse_args(argv)
+
+    with open(args.levels, 'r') as levels_file:
+        levels = json.load(levels_file)
+    report = sweep(levels, args.runs, args.max_time, args.workers, args.seed)
+    print(json.dumps(report, indent=4))
+    if args.output:
+        with open(args.output, 'w') as report_file:
+            json.dump(report, report_file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+""" Many independent PolyBounce worlds stepped in lockstep behind one
+array-in, arrays-out API, for automated play-testing.
+"""
+from typing import Optional
+
+import numpy as np
+
+from simulation import LevelSimulation
+
+
+class VectorEnv:
+    """ num_envs copies of one level, each a LevelSimulation with its own
+    PhysicsEngine and space.
+
+    step() takes a (num_envs, 2) array of (angle, speed) launches, where a
+    speed of 0 (or NaN) means leave that ball alone, and returns the same
+    preallocated observation arrays every time:
+
+        ball_positions   (num_envs, 2) float64
+        ball_velocities  (num_envs, 2) float64
+        ring_angles      (num_envs, rings) float64
+        side_alive       (num_envs, sides) bool
+        cleared          (num_envs,) bool
+
+    Copy them if you need to keep an observation past the next step().
+    """
+
+    def __init__(self, level: dict, num_envs: int, seed: int = 0, steps_per_action: int = 1):
+        self.level = level
+        self.num_envs = num_envs
+        self.seed = seed
+        self.steps_per_action = steps_per_action
+        self.simulations = [self.make_simulation(i) for i in range(num_envs)]
+
+        rings = len(level['Rings'])
+        sides = sum(level['Rings'])
+        self.ball_positions = np.zeros((num_envs, 2))
+        self.ball_velocities = np.zeros((num_envs, 2))
+        self.ring_angles = np.zeros((num_envs, rings))
+        self.side_alive = np.zeros((num_envs, sides), dtype=bool)
+        self.cleared = np.zeros(num_envs, dtype=bool)
+        self.resets = np.zeros(num_envs, dtype=np.int64)
+
+    def make_simulation(self, index: int, resets: int = 0) -> LevelSimulation:
+        return LevelSimulation(self.level, seed=int(self.seed + index + resets * self.num_envs), auto_launch=False)
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> tuple[np.ndarray, ...]:
+        """ Rebuild the worlds where mask is True, or all of them, with fresh
+        seeds.
+        """
+        indices = range(self.num_envs) if mask is None else np.flatnonzero(mask)
+        for i in indices:
+            self.resets[i] += 1
+            self.simulations[i] = self.make_simulation(i, self.resets[i])
+        return self.observe()
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, ...]:
+        actions = np.asarray(actions, dtype=np.float64).reshape(self.num_envs, 2)
+        launch = np.flatnonzero(np.nan_to_num(actions[:, 1]) > 0)
+        for i in launch.tolist():
+            self.simulations[i].launch(actions[i, 0], actions[i, 1])
+        for _ in range(self.steps_per_action):
+            for simulation in self.simulations:
+                if not simulation.cleared:
+                    simulation.step()
+        return self.observe()
+
+    def observe(self) -> tuple[np.ndarray, ...]:
+        for i, simulation in enumerate(self.simulations):
+            body = simulation.ball.body
+            self.ball_positions[i] = body.position
+            self.ball_velocities[i] = body.velocity
+            self.ring_angles[i] = [ring_body.angle for ring_body in simulation.ring_bodies]
+            self.side_alive[i] = [side.space is not None for side in simulation.sides]
+            self.cleared[i] = simulation.cleared
+        return self.ball_positions, self.ball_velocities, self.ring_angles, self.side_alive, self.cleared
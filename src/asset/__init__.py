@@ -1,2 +1,4 @@
 from src.asset.asset import Asset
 from src.asset.shape import Shape
+from src.asset.cache import SpriteCache
+from src.asset.rotation import RotationCache
@@ -1,18 +1,28 @@
 from typing import Optional
 
 import pygame
-from pygame import mask, Surface, Color
+from pygame import mask, Color, Mask, Surface
 
 from asset.shape import Shape
+from asset.cache import SpriteCache, sprite_cache
+from asset.palette import KEY, INK
+from asset.rotation import RotatedFrames, RotationCache, rotation_cache
 
 
 class Asset(pygame.sprite.Sprite):
+    # Where every asset gets its (shared) image and mask from
+    sprite_cache: SpriteCache = sprite_cache
+    # Pre-rotated frames for assets that spin, see set_angle()
+    rotation_cache: RotationCache = rotation_cache
+
     def __init__(self,
                  groups,
                  shape: Shape,
                  color: Color,
                  position: tuple[float, float],
-                 surface: Optional[Surface] = None):
+                 surface: Optional[Surface] = None,
+                 collides: bool = True,
+                 indexed: bool = False):
         self.groups = groups
         super().__init__(groups)
         self.shape = shape
@@ -20,10 +30,120 @@ class Asset(pygame.sprite.Sprite):
         self.position = [position[0], position[1]]
         self.surface = surface
 
-        self.image, self.rect = self.shape.get_image_rect(self.color)
+        # Assets that never take part in pixel collisions (the HUD) never get
+        # a mask at all, for the rest it's made the first time it's asked for
+        self.collides = collides
+        self._mask: Optional[Mask] = None
+
+        # Indexed assets are 8-bit palette images, recolored through their
+        # palette without drawing anything again (see set_color())
+        self.indexed = indexed
+
+        # Shared with every other asset of the same shape and color until
+        # get_writable_image() is called
+        self.load_image()
+        self.shared_image = True
         self.rect.center = self.position
-        self.image.set_colorkey([0, 0, 0])
-        self.mask = mask.from_surface(self.image)
+        self.rotation: Optional[RotatedFrames] = None
+        self.frame: Optional[int] = None
+
+    def load_image(self) -> None:
+        if self.indexed:
+            indices, self.rect = self.sprite_cache.get_indexed(self.shape)
+            # Shares the pixels of the cached image, but not its palette
+            self.image = indices.subsurface(indices.get_rect())
+            self.image.set_palette_at(INK, self.color)
+            self.image.set_colorkey(KEY)
+        else:
+            self.image, self.rect = self.sprite_cache.get(self.shape, self.color)
+
+    @property
+    def mask(self) -> Optional[Mask]:
+        """ The mask of the current image, None for assets that don't
+        collide. Shared images share their mask too.
+        """
+        if not self.collides:
+            return None
+        if self._mask is None:
+            if not self.shared_image:
+                self._mask = mask.from_surface(self.image)
+            elif self.rotation is not None:
+                self._mask = self.rotation.get_mask(self.frame)
+            else:
+                self._mask = self.sprite_cache.get_mask(self.shape, None if self.indexed else self.color)
+        return self._mask
+
+    @mask.setter
+    def mask(self, value: Optional[Mask]) -> None:
+        self._mask = value
+
+    def invalidate_mask(self) -> None:
+        """ Forget the mask, the next access makes it from the image again. """
+        self._mask = None
+
+    def set_shape(self, shape: Shape, color: Color) -> None:
+        """ Turn this asset into a different shape and/or color, keeping its
+        position. Lets pooled assets be reused instead of rebuilt.
+        """
+        self.shape = shape
+        self.color = color
+        self.load_image()
+        self.shared_image = True
+        self._mask = None
+        self.rect.center = self.position
+        self.rotation = None
+        self.frame = None
+
+    def set_color(self, color: Color) -> None:
+        """ Recolor the asset. Indexed and rotated assets only swap a palette
+        entry or a frame; the rest get the cached image of the new color,
+        which loses anything drawn on a writable image.
+        """
+        if self.rotation is not None:
+            self.color = color
+            self.image = self.rotation.get_images(color)[self.frame]
+        elif self.indexed:
+            self.color = color
+            self.image.set_palette_at(INK, color)
+        else:
+            self.set_shape(self.shape, color)
+
+    def set_palette(self, colors: list[Color]) -> None:
+        """ Recolor an indexed asset drawn in more than one shade, colors[i]
+        goes to palette index INK + i. Takes a Palette row as is.
+        """
+        for i, color in enumerate(colors):
+            self.image.set_palette_at(INK + i, color)
+        self.color = colors[0]
+
+    def set_angle(self, angle: float) -> None:
+        """ Turn the asset to angle (radians, like pymunk) around its position,
+        using the nearest of the cached pre-rotated frames. Nothing is
+        rotated per call, the first call just builds (or finds) the frames.
+        """
+        if self.rotation is None:
+            self.rotation = self.rotation_cache.get(self.shape)
+            self.frame = None
+        frame = self.rotation.get_index(angle)
+        if frame != self.frame:
+            self.frame = frame
+            self.image = self.rotation.get_images(self.color)[frame]
+            self._mask = None
+            self.rect = self.image.get_frect()
+            self.shared_image = True
+        offset_x, offset_y = self.rotation.offsets[frame]
+        self.rect.center = (self.position[0] + offset_x, self.position[1] + offset_y)
+
+    def get_writable_image(self) -> Surface:
+        """ The image, copied first if it's still the cached one, so drawing on
+        it won't change every other asset that looks the same. The caller is
+        about to draw on it, so the mask is dropped and made again on demand.
+        """
+        if self.shared_image:
+            self.image = self.image.copy()
+            self.shared_image = False
+        self._mask = None
+        return self.image
 
     def draw(self, surface: Surface) -> None:
         surface.blit(self.image, list(self.rect.topleft))
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from typing import Optional
+
+from pygame import mask, Color, FRect, Mask, Surface
+
+from asset.palette import get_indexed_image
+from asset.shape import Shape
+
+
+class SpriteCache:
+    """ Process-wide store of rasterized shapes and their masks. Two assets
+    with the same shape and color get the very same Surface and Mask, so a
+    ring with twenty identical sides only draws one of them. Masks are only
+    made once get_mask() asks for them.
+
+    The images are shared: anything that wants to draw on its image has to
+    copy it first (Asset.get_writable_image() does that). Once the images add
+    up to more than max_bytes, the least recently used ones are dropped.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        # [image, mask or None until asked for, bytes] by key
+        self.entries: OrderedDict[tuple, list] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(shape: Shape, color: Optional[Color]) -> tuple:
+        """ color None is the indexed image of the shape, see get_indexed(). """
+        return shape.get_cache_key() + ((None,) if color is None else (tuple(Color(color)),))
+
+    @staticmethod
+    def get_size(image: Surface) -> int:
+        """ Rough bytes held by an image plus its mask (one bit per pixel). """
+        width, height = image.get_size()
+        return image.get_pitch() * height + (width * height) // 8
+
+    def get(self, shape: Shape, color: Color) -> tuple[Surface, FRect]:
+        """ The shared image for shape in color, plus a fresh rect since every
+        asset moves its own.
+        """
+        key = self.get_key(shape, color)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0], entry[0].get_frect()
+
+        self.misses += 1
+        image, rect = shape.get_image_rect(color)
+        image.set_colorkey([0, 0, 0])
+        self.add(key, image)
+        return image, rect
+
+    def add(self, key: tuple, image: Surface) -> None:
+        size = self.get_size(image)
+        self.entries[key] = [image, None, size]
+        self.bytes += size
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, _, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+
+    def get_indexed(self, shape: Shape) -> tuple[Surface, FRect]:
+        """ The shared 8-bit image of shape in palette indices (see
+        asset.palette), for every color at once. Don't change its palette,
+        recolor a subsurface of it instead, that shares the pixels but has a
+        palette of its own.
+        """
+        key = self.get_key(shape, None)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0], entry[0].get_frect()
+
+        self.misses += 1
+        image = get_indexed_image(shape)
+        self.add(key, image)
+        return image, image.get_frect()
+
+    def get_mask(self, shape: Shape, color: Optional[Color]) -> Mask:
+        """ The shared mask of shape in color (None for the indexed image).
+        Only worked out the first time something asks, most images never take
+        part in a pixel collision.
+        """
+        key = self.get_key(shape, color)
+        if key not in self.entries and color is None:
+            self.get_indexed(shape)
+        elif key not in self.entries:
+            self.get(shape, color)
+        entry = self.entries[key]
+        if entry[1] is None:
+            entry[1] = mask.from_surface(entry[0])
+        return entry[1]
+
+    def get_hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_stats(self) -> dict[str, float]:
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.get_hit_rate(),
+                'entries': len(self.entries),
+                'bytes': self.bytes}
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+
+# Shared by every Asset, see Asset.sprite_cache
+sprite_cache = SpriteCache()
@@ -0,0 +1,46 @@
+""" Regular polygon and ring geometry as NumPy arrays.
+
+The unit polygon for each N is worked out once and cached; everything else is
+a scale and a translate of that template, so there's no per-vertex Python.
+Orientation matches REG_POLY: vertex i sits at tilt + theta * i for i in 1..N,
+which always leaves a flat 'floor'.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def unit_polygon(N: int) -> np.ndarray:
+    """ (N, 2) vertices of a regular N-gon with radius 1 centered on (0, 0).
+    The array is shared between callers, so it's read-only.
+    """
+    theta = (2 * np.pi) / N  # Exterior angle, the radians between each vertex.
+    tilt = (np.pi - theta) / 2  # Causes the generated polygon to always have a 'floor'.
+    angles = tilt + theta * np.arange(1, N + 1)
+    vertices = np.column_stack((np.cos(angles), np.sin(angles)))
+    vertices.flags.writeable = False
+    return vertices
+
+
+def regular_polygon(N: int, radius: float, center: tuple[float, float] = (0, 0)) -> np.ndarray:
+    """ (N, 2) float64 vertices of a regular N-gon around center. """
+    return unit_polygon(N) * radius + np.asarray(center, dtype=np.float64)
+
+
+def ring_quads(N: int,
+               inner_radius: float,
+               outer_radius: float,
+               center: tuple[float, float] = (0, 0)) -> np.ndarray:
+    """ Every side of an N-sided ring in one (N, 4, 2) array. Each quad is
+    (inner_start, outer_start, outer_end, inner_end), which winds the same way
+    for every side so pymunk and pygame can both take it as is.
+    """
+    unit = unit_polygon(N)
+    unit_next = np.roll(unit, -1, axis=0)
+    quads = np.stack((unit * inner_radius,
+                      unit * outer_radius,
+                      unit_next * outer_radius,
+                      unit_next * inner_radius), axis=1)
+    quads += np.asarray(center, dtype=np.float64)
+    return quads
@@ -0,0 +1,59 @@
+""" data/palette.json as palette rows for 8-bit indexed sprites.
+
+An indexed sprite is rasterized once, into palette indices instead of colors:
+KEY where it's see-through and INK (and up) where it's drawn. What color INK
+shows as lives in the surface's palette, so recoloring a sprite is a
+set_palette_at() rather than drawing it again. Every color in palette.json is
+a row of shades, a gradient, that fits in the slots from INK on.
+"""
+import json
+from collections.abc import Mapping
+
+from pygame import Color, Surface
+
+from asset.shape import Shape
+
+# Palette index of the see-through background and of the first drawn shade
+KEY, INK = 0, 1
+
+
+class Palette(Mapping):
+    """ The colors of palette.json by name. palette[name] is the row of shades
+    of that color, brightest first, so it's a drop-in for the plain dict.
+    """
+
+    def __init__(self, rows: dict[str, list]):
+        self.rows: dict[str, list[Color]] = {name: [Color(value) for value in shades]
+                                              for name, shades in rows.items()}
+
+    @classmethod
+    def load(cls, filename: str) -> 'Palette':
+        with open(filename, 'r') as palette_file:
+            return cls(json.load(palette_file))
+
+    def __getitem__(self, name: str) -> list[Color]:
+        return self.rows[name]
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get_row(self, name: str, shades: int = None) -> list[Color]:
+        """ The first shades shades of name, the palette row a gradient sprite
+        is recolored with (see Asset.set_palette()).
+        """
+        return self.rows[name][:shades]
+
+
+def get_indexed_image(shape: Shape) -> Surface:
+    """ shape rasterized into an 8-bit surface of KEY and INK indices. Its own
+    palette shows INK as white.
+    """
+    image, _ = shape.get_image_rect(Color('white'))
+    indexed = Surface(image.get_size(), depth=8)
+    indexed.set_palette([Color('black'), Color('white')])
+    indexed.blit(image, (0, 0))
+    indexed.set_colorkey(KEY)
+    return indexed
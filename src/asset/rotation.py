@@ -0,0 +1,138 @@
+import math
+from collections import OrderedDict
+from typing import Optional
+
+import pygame
+from pygame import mask, Color, Mask, Rect, Surface
+
+from asset.palette import KEY, INK, get_indexed_image
+from asset.shape import Shape
+
+
+class RotatedFrames:
+    """ One shape pre-rotated to K evenly spaced angles.
+
+    Every frame is trimmed down to its visible pixels and packed into a single
+    8-bit atlas of palette indices, so there's one block of pixels per shape
+    no matter how many angles or colors. Colors are subsurfaces of the atlas
+    with their own palette (get_images()), which copies no pixels. Trimming
+    moves the middle of a frame away from the point it was rotated around,
+    offsets[k] is how far, so the frame can be put back where the untrimmed
+    one would be.
+    """
+
+    def __init__(self, shape: Shape, frames: int):
+        self.frames = frames
+        self.step = 2 * math.pi / frames
+
+        indexed = get_indexed_image(shape)
+
+        rotated = []
+        for k in range(frames):
+            # pymunk angles turn clockwise on screen, pygame's counterclockwise
+            frame = pygame.transform.rotate(indexed, -math.degrees(k * self.step))
+            bounds = frame.get_bounding_rect()
+            if bounds.size == (0, 0):
+                bounds = Rect(0, 0, 1, 1)
+            rotated.append((frame, bounds))
+
+        # Shelf packing: left to right, a new row once the atlas is wide enough
+        max_width = max(bounds.width for _, bounds in rotated)
+        atlas_width = max_width * math.ceil(math.sqrt(frames))
+        self.areas: list[Rect] = []
+        x = y = row_height = 0
+        for _, bounds in rotated:
+            if x + bounds.width > atlas_width:
+                x, y, row_height = 0, y + row_height, 0
+            self.areas.append(Rect(x, y, bounds.width, bounds.height))
+            x += bounds.width
+            row_height = max(row_height, bounds.height)
+
+        self.atlas = Surface((atlas_width, y + row_height), depth=8)
+        self.atlas.set_palette([Color('black'), Color('white')])
+        # Filled in by get_mask(), frames that never collide never get one
+        self.masks: list[Optional[Mask]] = [None] * frames
+        self.offsets: list[tuple[float, float]] = []
+        for (frame, bounds), area in zip(rotated, self.areas):
+            self.atlas.blit(frame, area, bounds)
+            self.offsets.append((bounds.centerx - frame.get_width() / 2,
+                                 bounds.centery - frame.get_height() / 2))
+        self.images: dict[tuple, list[Surface]] = {}
+
+    def get_index(self, angle: float) -> int:
+        """ The frame nearest to angle (radians). """
+        return round(angle / self.step) % self.frames
+
+    def get_mask(self, index: int) -> Mask:
+        if self.masks[index] is None:
+            image = self.atlas.subsurface(self.areas[index])
+            image.set_colorkey(KEY)
+            self.masks[index] = mask.from_surface(image)
+        return self.masks[index]
+
+    def get_images(self, color: Color) -> list[Surface]:
+        """ Every frame in color, as views into the shared atlas. """
+        key = tuple(Color(color))
+        images = self.images.get(key)
+        if images is None:
+            images = []
+            for area in self.areas:
+                image = self.atlas.subsurface(area)
+                image.set_palette_at(INK, color)
+                image.set_colorkey(KEY)
+                images.append(image)
+            self.images[key] = images
+        return images
+
+    def get_size(self) -> int:
+        """ Rough bytes held by the atlas and the masks. """
+        width, height = self.atlas.get_size()
+        return self.atlas.get_pitch() * height + (width * height) // 8
+
+
+class RotationCache:
+    """ RotatedFrames by shape, so every side of every ring that looks the
+    same shares one atlas whatever its color. Bounded by max_bytes like
+    SpriteCache.
+    """
+
+    def __init__(self, frames: int = 90, max_bytes: int = 64 * 1024 * 1024):
+        self.frames = frames
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[tuple, RotatedFrames] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, shape: Shape) -> RotatedFrames:
+        key = shape.get_cache_key() + (self.frames,)
+        rotated = self.entries.get(key)
+        if rotated is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return rotated
+
+        self.misses += 1
+        rotated = RotatedFrames(shape, self.frames)
+        self.entries[key] = rotated
+        self.bytes += rotated.get_size()
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.get_size()
+        return rotated
+
+    def get_stats(self) -> dict[str, float]:
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self.entries),
+                'bytes': self.bytes}
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+
+# Shared by every Asset, see Asset.rotation_cache
+rotation_cache = RotationCache()
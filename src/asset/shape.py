@@ -1,11 +1,12 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 
-import numpy as np
 import pygame
 from pygame import Surface, Color, FRect
 from pygame import gfxdraw
 
+from asset.geometry import regular_polygon
+
 
 class Shape(ABC):
     def __init__(self):
@@ -25,6 +26,18 @@ class Shape(ABC):
     def get_height(self) -> float:
         pass
 
+    def get_cache_key(self) -> tuple:
+        """ Everything that changes how this shape rasterizes, as a hashable
+        tuple. Lists (like POLY's vertices) are frozen into tuples.
+        """
+        values = []
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if isinstance(value, list):
+                value = tuple(tuple(item) if isinstance(item, list) else item for item in value)
+            values.append(value)
+        return (type(self).__name__, *values)
+
     def get_blank_surface(self) -> Surface:
         return Surface([self.get_width(), self.get_height()])
 
@@ -66,20 +79,19 @@ class POLY(Shape):
         return self.get_width() / 2, self.get_height() / 2
 
     def get_width(self) -> float:
-        self.vertices.sort(key=lambda vertex: vertex[0])
-        min_x = self.vertices[0][0]
-        max_x = self.vertices[len(self.vertices)][0]
-        return max_x - min_x
+        x_values = [vertex[0] for vertex in self.vertices]
+        return max(x_values) - min(x_values)
 
     def get_height(self) -> float:
-        self.vertices.sort(key=lambda vertex: vertex[1])
-        min_y = self.vertices[0][1]
-        max_y = self.vertices[len(self.vertices)][1]
-        return max_y - min_y
+        y_values = [vertex[1] for vertex in self.vertices]
+        return max(y_values) - min(y_values)
 
     def get_image_rect(self, color: Color) -> tuple[Surface, FRect]:
         image = super().get_blank_surface()
-        gfxdraw.filled_polygon(image, self.vertices, color)
+        # Shifted so the top left of the bounding box lands on (0, 0)
+        min_x = min(vertex[0] for vertex in self.vertices)
+        min_y = min(vertex[1] for vertex in self.vertices)
+        gfxdraw.filled_polygon(image, [(x - min_x, y - min_y) for x, y in self.vertices], color)
         return image, image.get_frect()
 
 
@@ -101,14 +113,7 @@ class REG_POLY(Shape):
         return self.radius
 
     def get_vertices(self) -> list[tuple[float, float]]:
-        theta = (2 * np.pi) / self.N  # Exterior angle, the radians between each vertex.
-        tilt = (np.pi - theta) / 2  # Causes the generated polygon to always have a 'floor'.
-        vertices = []
-        for i in range(1, self.N + 1):
-            x = (self.radius * np.cos(tilt + theta * i)) + self.get_center_offset()[0]
-            y = (self.radius * np.sin(tilt + theta * i)) + self.get_center_offset()[1]
-            vertices.append((x, y))
-        return vertices
+        return regular_polygon(self.N, self.radius, self.center_offset).tolist()
 
     def get_image_rect(self, color: Color) -> tuple[Surface, FRect]:
         image = super().get_blank_surface()
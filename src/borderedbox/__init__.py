@@ -1 +1,3 @@
 from src.borderedbox.borderedbox import BorderedBox
+from src.borderedbox.textcache import TextCache
+from src.borderedbox.hud import HUDCompositor
@@ -1,37 +1,46 @@
+from typing import Optional
+
 from pygame import Color, Font
 
 from asset import Asset
+from asset.palette import INK
 from asset.shape import BOX
+from borderedbox.textcache import TextCache, text_cache
+from fonts import FontManager, font_manager
+
+
+# Palette index of the text, the background is INK
+TEXT = INK + 1
 
 
 class BorderedBox:
+    # Every box renders its text through this, hits/misses are counted there
+    text_cache: TextCache = text_cache
+    # Boxes with the same font_size share one Font
+    font_manager: FontManager = font_manager
+
     def __init__(self, game, fixed_text: str, bg_color: Color, font_color: Color,
                  font_size: int, width: float, height: float, border: int,
-                 position: tuple[float, float]):
+                 position: tuple[float, float], groups: Optional[list] = None):
         self.game = game
-        self.font: Font = self.game.font
-        self.asset = Asset([self.game.all_entities, self.game.HUD],
+        self.font: Font = self.font_manager.get(font_size)
+        # Boxes drawn by a HUDCompositor pass groups=[] so they aren't sprites
+        if groups is None:
+            groups = [self.game.all_entities, self.game.HUD]
+        self.asset = Asset(groups,
                            BOX(width, height, border),
                            bg_color,
-                           position)
+                           position,
+                           collides=False,
+                           indexed=True)
         self.border = border
         self.font_color = font_color
         self.bg_color = bg_color
 
         self.fixed_text = fixed_text
-        self.fixed_text_image = self.font.render(self.fixed_text, False, self.font_color)
-        self.fixed_text_rect = self.fixed_text_image.get_bounding_rect()
-
         self.text = 'look away...'
-        self.text_image = self.font.render(self.text, False, self.font_color)
-        self.text_rect = self.text_image.get_bounding_rect()
-        self.text_rect.clamp_ip(self.asset.rect)
-        self.text_rect.clip(self.asset.rect)
-
-        self.asset.image.blit(self.fixed_text_image,
-                              [self.get_left_align_x(), self.get_center_align_y(self.fixed_text)]),
-        self.asset.image.blit(self.text_image,
-                              [self.get_right_align_x(self.text), self.get_center_align_y(self.text)])
+        self.changed = True  # since a HUDCompositor last copied the image
+        self.compose()
 
         self.update_func = None
 
@@ -46,27 +55,42 @@ class BorderedBox:
         text_width = self.font.size(text)[0]
         return self.asset.rect.width-(self.border*2)-text_width
 
-    def draw(self, surface) -> None:
-        self.asset.image.fill(self.bg_color)
-        # self.asset.image, self.asset.rect = self.asset.shape.get_image_rect(self.bg_color)
-        self.fixed_text_image = self.font.render(self.fixed_text, False, self.font_color)
-        self.text_image = self.font.render(self.text, False, self.font_color)
-        self.text_rect = self.text_image.get_bounding_rect()
-        self.text_rect.clamp_ip(self.asset.rect)
-        self.asset.image.blit(self.fixed_text_image,
-                              [self.get_left_align_x(), self.get_center_align_y(self.fixed_text)]),
-        self.asset.image.blit(self.text_image,
-                              [self.get_right_align_x(self.text), self.get_center_align_y(self.text)])
+    def compose(self) -> None:
+        """ Repaint the box's image with the current text. The image is 8-bit,
+        the background is drawn in palette index INK and the text in TEXT, so
+        color changes only touch the palette.
+        """
+        image = self.asset.get_writable_image()
+        image.set_palette_at(INK, self.bg_color)
+        image.set_palette_at(TEXT, self.font_color)
+        image.fill(INK)
+        fixed_text_mask = self.text_cache.get_mask(self.font, self.fixed_text)
+        text_mask = self.text_cache.get_mask(self.font, self.text)
+        fixed_text_mask.to_surface(image, setcolor=TEXT, unsetcolor=None,
+                                   dest=[self.get_left_align_x(), self.get_center_align_y(self.fixed_text)])
+        text_mask.to_surface(image, setcolor=TEXT, unsetcolor=None,
+                             dest=[self.get_right_align_x(self.text), self.get_center_align_y(self.text)])
+        self.changed = True
 
+    def draw(self, surface) -> None:
         self.asset.draw(surface)
 
     def update(self, dt: float) -> None:
-        self.asset.update()
+        self.asset.update(dt)
         self.draw(self.game.screen)
 
     def set_text(self, text: str) -> None:
+        if text == self.text:
+            return
         self.text = text
-        self.draw(self.game.screen)
+        self.compose()
 
     def set_bg_color(self, bg_color: Color) -> None:
-        self.bg_color = bg_color
\ No newline at end of file
+        self.bg_color = bg_color
+        self.asset.image.set_palette_at(INK, bg_color)
+        self.changed = True
+
+    def set_font_color(self, font_color: Color) -> None:
+        self.font_color = font_color
+        self.asset.image.set_palette_at(TEXT, font_color)
+        self.changed = True
@@ -0,0 +1,82 @@
+from typing import Callable, Optional
+
+from pygame import Rect, Surface
+
+from borderedbox.borderedbox import BorderedBox
+
+
+class HUDCompositor:
+    """ All the HUD boxes on one cached surface.
+
+    update() polls every box's update function and only redraws the boxes
+    whose text (or colors) actually changed, into their spot on the layer.
+    draw() is then a single blits() call of the layer, cut down to the boxes
+    (the gaps between them are most of its area), and changed holds the
+    screen rects that are different from last frame, for partial display
+    updates. On a frame where nothing changed the HUD costs a few string
+    compares and one opaque blit per box. Boxes added with poll=False aren't
+    even asked, refresh() (say, from an event bus subscription) flags them
+    for the next update().
+    """
+
+    def __init__(self):
+        self.boxes: list[BorderedBox] = []
+        self.update_funcs: list[Optional[Callable[[], object]]] = []
+        self.polled: list[bool] = []
+        self.stale: list[bool] = []
+        self.surface: Optional[Surface] = None
+        self.rect = Rect(0, 0, 0, 0)
+        self.areas: list[tuple[Surface, Rect, Rect]] = []  # blits() arguments
+        self.changed: list[Rect] = []
+
+    def add(self, box: BorderedBox, update_func: Optional[Callable[[], object]] = None,
+            poll: bool = True) -> None:
+        self.boxes.append(box)
+        self.update_funcs.append(update_func)
+        self.polled.append(poll)
+        self.stale.append(True)
+        self.surface = None  # rebuilt to fit on the next update()
+
+    def refresh(self, box: BorderedBox) -> None:
+        """ Ask box's update function again on the next update(). """
+        self.stale[self.boxes.index(box)] = True
+
+    def get_box_rect(self, box: BorderedBox) -> Rect:
+        return Rect(box.asset.rect)
+
+    def build(self) -> None:
+        """ Lay the layer out around all the boxes and draw every one. """
+        self.rect = self.get_box_rect(self.boxes[0]).unionall([self.get_box_rect(box) for box in self.boxes])
+        self.surface = Surface(self.rect.size)
+        self.areas = []
+        for box in self.boxes:
+            rect = self.get_box_rect(box)
+            area = self.surface.blit(box.asset.image, rect.move(-self.rect.x, -self.rect.y))
+            self.areas.append((self.surface, rect, area))
+            box.changed = False
+        self.changed = [self.rect.copy()]
+
+    def update(self) -> list[Rect]:
+        """ Bring every box up to date. Returns (and keeps in changed) the
+        screen rects that were redrawn.
+        """
+        rebuild = self.surface is None
+        self.changed = []
+        for i, (box, update_func) in enumerate(zip(self.boxes, self.update_funcs)):
+            if update_func is not None and (self.polled[i] or self.stale[i]):
+                box.set_text(str(update_func()))
+                self.stale[i] = False
+            if not rebuild and box.changed:
+                rect = self.get_box_rect(box)
+                self.surface.blit(box.asset.image, rect.move(-self.rect.x, -self.rect.y))
+                box.changed = False
+                self.changed.append(rect)
+        if rebuild:
+            self.build()
+        return self.changed
+
+    def draw(self, surface: Surface) -> Rect:
+        if self.surface is None:
+            self.update()
+        surface.blits(self.areas, doreturn=False)
+        return self.rect
@@ -0,0 +1,60 @@
+from collections import OrderedDict
+
+from pygame import mask, Color, Font, Mask, Surface
+
+
+class TextCache:
+    """ Remembers rendered text surfaces so the same string in the same font
+    and color is only rasterized once. Least recently used entries are thrown
+    out once there are more than capacity of them.
+
+    The surfaces handed out are shared, so blit them, don't draw on them.
+    Masks of text (get_mask()) live in the same LRU.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.surfaces: OrderedDict[tuple, Surface | Mask] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: Font, text: str, color: Color, antialias: bool = False) -> Surface:
+        key = (font, text, tuple(Color(color)), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def get_mask(self, font: Font, text: str) -> Mask:
+        """ The pixels text sets, whatever its color. """
+        key = (font, text, None, False)
+        text_mask = self.surfaces.get(key)
+        if text_mask is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return text_mask
+        self.misses += 1
+        text_mask = mask.from_surface(font.render(text, False, Color('white')))
+        self.surfaces[key] = text_mask
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return text_mask
+
+    def get_stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.surfaces)}
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Shared by every BorderedBox, see BorderedBox.text_cache
+text_cache = TextCache()
@@ -0,0 +1,92 @@
+""" Collision types, shape filters and the per-step collision event buffer.
+
+Collision types pack the kind of entity and its palette color index together,
+so a handler registered for (BALL, c) and (SIDE, c) only ever fires for a ball
+touching a side of the same color. Every other contact is resolved entirely
+inside Chipmunk without calling back into Python.
+"""
+from enum import IntEnum
+
+import numpy as np
+import pymunk
+
+
+class EntityKind(IntEnum):
+    BALL = 1
+    SIDE = 2
+    WALL = 3
+    DEBRIS = 4
+
+
+class CollisionPhase(IntEnum):
+    BEGIN = 0
+    SEPARATE = 1
+
+
+# Low bits of a collision type hold the color index, the rest the kind
+COLOR_BITS = 8
+COLOR_MASK = (1 << COLOR_BITS) - 1
+
+CATEGORIES = {
+    EntityKind.BALL: 0b0001,
+    EntityKind.SIDE: 0b0010,
+    EntityKind.WALL: 0b0100,
+    EntityKind.DEBRIS: 0b1000,
+}
+COLLIDES_WITH = {
+    EntityKind.BALL: CATEGORIES[EntityKind.SIDE] | CATEGORIES[EntityKind.WALL],
+    EntityKind.SIDE: CATEGORIES[EntityKind.BALL] | CATEGORIES[EntityKind.DEBRIS],
+    EntityKind.WALL: CATEGORIES[EntityKind.BALL] | CATEGORIES[EntityKind.DEBRIS],
+    EntityKind.DEBRIS: CATEGORIES[EntityKind.SIDE] | CATEGORIES[EntityKind.WALL],
+}
+
+EVENT_DTYPE = np.dtype([
+    ('phase', np.uint8),
+    ('type_a', np.uint16),
+    ('type_b', np.uint16),
+    ('shape_a', np.int32),   # ids handed out by PhysicsEngine.register_shape()
+    ('shape_b', np.int32),
+    ('x', np.float32),       # first contact point, world coordinates
+    ('y', np.float32),
+])
+
+
+def get_collision_type(kind: EntityKind, color_index: int = 0) -> int:
+    return (int(kind) << COLOR_BITS) | color_index
+
+
+def split_collision_type(collision_type: int) -> tuple[EntityKind, int]:
+    return EntityKind(collision_type >> COLOR_BITS), collision_type & COLOR_MASK
+
+
+def get_filter(kind: EntityKind) -> pymunk.ShapeFilter:
+    """ Kinds that can never touch (two balls, a ball and debris) are culled
+    by the broadphase before any collision handler is looked up.
+    """
+    return pymunk.ShapeFilter(categories=CATEGORIES[kind], mask=COLLIDES_WITH[kind])
+
+
+class CollisionBuffer:
+    """ Fixed-size record of collision events, filled during space.step() and
+    emptied once per frame with drain(). Events past capacity are counted in
+    dropped instead of growing the buffer.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.events = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.count = 0
+        self.dropped = 0
+
+    def record(self, phase: CollisionPhase, type_a: int, type_b: int,
+               shape_a: int, shape_b: int, x: float, y: float) -> None:
+        if self.count == len(self.events):
+            self.dropped += 1
+            return
+        self.events[self.count] = (phase, type_a, type_b, shape_a, shape_b, x, y)
+        self.count += 1
+
+    def drain(self) -> np.ndarray:
+        """ Everything recorded since the last drain, oldest first. """
+        batch = self.events[:self.count].copy()
+        self.count = 0
+        return batch
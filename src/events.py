@@ -0,0 +1,115 @@
+""" A typed event bus: integer event types, subscriber lists indexed by type
+and reusable event records, so publishing allocates nothing per event.
+"""
+from enum import IntEnum
+from typing import Callable, Hashable
+
+
+class GameEvent(IntEnum):
+    COLLISION_BEGIN = 0     # key: id of the shape hit, value: its collision type
+    COLLISION_SEPARATE = 1  # key: id of the shape left, value: its collision type
+    SIDE_BROKEN = 2         # key: id of the side shape
+    RING_FROZEN = 3         # key: the ring's body
+    RING_THAWED = 4         # key: the ring's body
+    SCORE_CHANGED = 5       # value: the new score
+
+
+class Event:
+    """ One event. The records are owned by the bus and reused, so take what
+    you need from it inside the callback, don't keep it.
+    """
+
+    __slots__ = ('type', 'key', 'value', 'x', 'y')
+
+    def __init__(self):
+        self.type = 0
+        self.key = 0
+        self.value = 0
+        self.x = 0.0
+        self.y = 0.0
+
+    def set(self, event_type: int, key: Hashable, value: int, x: float, y: float) -> 'Event':
+        self.type = event_type
+        self.key = key
+        self.value = value
+        self.x = x
+        self.y = y
+        return self
+
+
+class EventBus:
+    """ Calls back whoever subscribed to an event type, either right away
+    (publish()) or once per frame (post() now, dispatch() later). Deferred
+    events are the safe choice from inside a physics step.
+
+    A subscription can also be for one key only (say, one side's shape id),
+    those are found with a dict lookup instead of every subscriber checking
+    the key itself.
+    """
+
+    def __init__(self, types: int = len(GameEvent), capacity: int = 256):
+        self.subscribers: list[list[Callable[[Event], None]]] = [[] for _ in range(types)]
+        self.keyed: list[dict[Hashable, list[Callable[[Event], None]]]] = [{} for _ in range(types)]
+        # One record per publish() in progress, callbacks can publish too
+        self.records = [Event()]
+        self.depth = 0
+        # The deferred queue, records reused frame after frame
+        self.queue = [Event() for _ in range(capacity)]
+        self.queued = 0
+
+    def subscribe(self, event_type: int, callback: Callable[[Event], None], key: Hashable = None) -> None:
+        if key is None:
+            self.subscribers[event_type].append(callback)
+        else:
+            self.keyed[event_type].setdefault(key, []).append(callback)
+
+    def unsubscribe(self, event_type: int, callback: Callable[[Event], None], key: Hashable = None) -> None:
+        if key is None:
+            self.subscribers[event_type].remove(callback)
+        else:
+            callbacks = self.keyed[event_type][key]
+            callbacks.remove(callback)
+            if not callbacks:
+                del self.keyed[event_type][key]
+
+    def deliver(self, event: Event) -> None:
+        for callback in self.subscribers[event.type]:
+            callback(event)
+        callbacks = self.keyed[event.type].get(event.key)
+        if callbacks:
+            for callback in callbacks:
+                callback(event)
+
+    def publish(self, event_type: int, key: Hashable = 0, value: int = 0, x: float = 0.0, y: float = 0.0) -> None:
+        """ Call the subscribers now. """
+        if not self.subscribers[event_type] and not self.keyed[event_type]:
+            return
+        if self.depth == len(self.records):
+            self.records.append(Event())
+        record = self.records[self.depth].set(event_type, key, value, x, y)
+        self.depth += 1
+        try:
+            self.deliver(record)
+        finally:
+            self.depth -= 1
+
+    def post(self, event_type: int, key: Hashable = 0, value: int = 0, x: float = 0.0, y: float = 0.0) -> None:
+        """ Queue the event for the next dispatch(). The queue grows if it has
+        to, and then stays that big.
+        """
+        if self.queued == len(self.queue):
+            self.queue.extend(Event() for _ in range(len(self.queue)))
+        self.queue[self.queued].set(event_type, key, value, x, y)
+        self.queued += 1
+
+    def dispatch(self) -> int:
+        """ Deliver everything posted since the last call, in order. Events
+        posted by the callbacks are delivered in this same call. Returns how
+        many were delivered.
+        """
+        i = 0
+        while i < self.queued:
+            self.deliver(self.queue[i])
+            i += 1
+        self.queued = 0
+        return i
@@ -0,0 +1,38 @@
+""" Loads the fonts that ship in data/fonts straight from their files. """
+import os
+
+import pygame
+from pygame import Font
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'fonts')
+DEFAULT_FONT = 'monogram.ttf'
+
+
+class FontManager:
+    """ One Font per (file, size), opened on first use. pygame.font.SysFont()
+    asks the OS for its whole font list before it can pick one, which is
+    slow on machines with lots of fonts and may not even find ours; opening
+    the bundled file directly is neither.
+    """
+
+    def __init__(self, font_dir: str = FONT_DIR, default: str = DEFAULT_FONT):
+        self.font_dir = font_dir
+        self.default = default
+        self.fonts: dict[tuple[str, int], Font] = {}
+
+    def get(self, size: int, filename: str = None) -> Font:
+        key = (filename or self.default, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = Font(os.path.join(self.font_dir, key[0]), size)
+            self.fonts[key] = font
+        return font
+
+    def clear(self) -> None:
+        self.fonts.clear()
+
+
+# Shared by the game and every BorderedBox, see BorderedBox.font_manager
+font_manager = FontManager()
@@ -1,19 +1,33 @@
+from typing import Optional
+
 import pygame
 
 from asset import Asset
+from events import Event, GameEvent
 
 
 class Enemy:
-    def __init__(self, game, asset: pygame.sprite.Sprite):
+    def __init__(self, game, asset: pygame.sprite.Sprite, shape_id: Optional[int] = None):
         self.game = game
         self.asset = asset
         self.hits_taken = 0
         self.hits_to_die = 1
+        # Hit through the game's event bus, only by collisions with our shape
+        self.shape_id = shape_id
+        self.events = getattr(game, 'events', None) if shape_id is not None else None
+        if self.events is not None:
+            self.events.subscribe(GameEvent.COLLISION_BEGIN, self.on_hit, key=shape_id)
+
+    def on_hit(self, event: Event) -> None:
+        self.take_hit()
 
     def take_hit(self, hit_strength: int = 1):
         self.hits_taken += hit_strength
         if self.hits_taken >= self.hits_to_die:
             self.asset.kill()
+            if self.events is not None:
+                self.events.unsubscribe(GameEvent.COLLISION_BEGIN, self.on_hit, key=self.shape_id)
+                self.events = None
 
 
 class Side:
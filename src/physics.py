@@ -1,12 +1,19 @@
 import math
+from itertools import chain
+from typing import Optional
 
+import numpy as np
 import pymunk
-from pymunk import pygame_util
 import pygame
 from pygame import Surface
 
 from asset.shape import BOX
 from asset import Asset
+from collision import (CollisionBuffer, CollisionPhase, EntityKind,
+                       get_collision_type, get_filter, split_collision_type)
+from events import EventBus, GameEvent
+from scheduler import Timer, TimerScheduler
+from timestep import FixedTimestep
 
 GRAVITY_STRENGTH = 3.8e5
 
@@ -15,87 +22,192 @@ class PhysicsEngine:
     """ Handles creation and updating of all game objects that need to be 
     physically simulated. Provides easy access to the Pymunk processes for my 
     purposes, without making other classes or functions overly complex. 
+
+    The engine doesn't need a game or a display to run. Pass a center and a
+    world size to get a headless engine (soak tests, benchmarks, CI), or call
+    set_game() to take both from a running PolyBounce.
     """
 
-    game = None
-    GAME_CENTER = (0, 0)
-    space = None
-    collision_handlers = []
-    # observers: dict[list[Asset]] = {}
+    def __init__(self,
+                 center: Optional[tuple[float, float]] = None,
+                 world_size: tuple[float, float] = (0, 0),
+                 game=None,
+                 vectorized_gravity: bool = True,
+                 step_rate: float = 120,
+                 max_steps: int = 5,
+                 collision_capacity: int = 1024,
+                 idle_speed_threshold: float = 0,
+                 sleep_time_threshold: float = math.inf,
+                 events: Optional[EventBus] = None):
+        self.space = pymunk.Space()
+        # Dynamic bodies slower than idle_speed_threshold for longer than
+        # sleep_time_threshold fall asleep and cost nothing until woken up
+        self.space.idle_speed_threshold = idle_speed_threshold
+        self.space.sleep_time_threshold = sleep_time_threshold
+        self.game = None
+        self.WORLD_SIZE = (world_size[0], world_size[1])
+        if center is None:
+            center = (world_size[0] / 2, world_size[1] / 2)
+        self.GAME_CENTER = pymunk.Vec2d(*center)
+        self.collision_handlers = []
+        self.collisions = CollisionBuffer(collision_capacity)
+        self.shapes_by_id: list[pymunk.Shape] = []
+        self.shape_ids: dict[pymunk.Shape, int] = {}
+        self.stepping = False
+        # Dynamic bodies pulled toward GAME_CENTER by apply_gravity() each step.
+        # With vectorized_gravity off, each body gets planet_gravity instead.
+        self.vectorized_gravity = vectorized_gravity
+        self.gravity_bodies: list[pymunk.Body] = []
+        # One kinematic body per ring, carrying all of that ring's sides
+        self.ring_bodies: list[pymunk.Body] = []
+        # Everything that happens after a while (thawing rings, level clocks,
+        # sides breaking off later) runs off this, on simulated time
+        self.timers = TimerScheduler()
+        # Frozen rings, with their thaw timer and how fast they were spinning
+        self.frozen: dict[pymunk.Body, tuple[Timer, float]] = {}
+        self.timestep = FixedTimestep(step_rate, max_steps)
+        self.steps = 0  # taken so far
+        # How many steps had been taken when each ring body was (re)built,
+        # a state from before that is some other ring's
+        self.built_at: dict[pymunk.Body, int] = {}
+        # Assets drawn at their body's position, and where those bodies were
+        # one step ago so they can be drawn in between.
+        self.attached: dict[pymunk.Body, Asset] = {}
+        self.previous_state: dict[pymunk.Body, tuple[pymunk.Vec2d, float]] = {}
+        # Collisions and thaws go here (deferred, it's mid-step) when there's a
+        # bus, collisions go to the CollisionBuffer when there isn't
+        self.events = events
+        if game is not None:
+            self.set_game(game)
 
+    @property
+    def headless(self) -> bool:
+        return self.game is None
 
-    @staticmethod
-    def set_game(game):
-        PhysicsEngine.space = pymunk.Space()
-        PhysicsEngine.game = game
-        PhysicsEngine.GAME_CENTER = pymunk.Vec2d(*game.CENTER)
-        print('the physics engine is set! CENTER @', str(PhysicsEngine.GAME_CENTER))
+    def set_game(self, game):
+        self.game = game
+        self.WORLD_SIZE = (game.SCREEN_SIZE[0], game.SCREEN_SIZE[1])
+        self.GAME_CENTER = pymunk.Vec2d(*game.CENTER)
+        print('the physics engine is set! CENTER @', str(self.GAME_CENTER))
 
-    @staticmethod
-    def planet_gravity(body: pymunk.Body, gravity: float, damping: float, dt: float):
-        distance_squared = body.position.get_dist_sqrd(PhysicsEngine.GAME_CENTER)
+    def planet_gravity(self, body: pymunk.Body, gravity: float, damping: float, dt: float):
+        distance_squared = body.position.get_dist_sqrd(self.GAME_CENTER)
         G = (
-            body.position - (pymunk.Vec2d(PhysicsEngine.game.CENTER[0], PhysicsEngine.game.CENTER[1]))
+            (body.position - self.GAME_CENTER)
             * -GRAVITY_STRENGTH
             / (distance_squared * math.sqrt(distance_squared))
         )
         # Replacing the built-in velocity with this one
         pymunk.Body.update_velocity(body, G, damping, dt)
 
-    @staticmethod
-    def add_collision_handler(shape, other_shape):
-        """ TODO: Generate a bitmask given the entity type and the color. """
-        handler = PhysicsEngine.space.add_collision_handler(1, 2)
-        handler.begin = PhysicsEngine.begin
-        handler.pre_solve = PhysicsEngine.pre_solve
-        handler.post_solve = PhysicsEngine.post_solve
-        handler.separate = PhysicsEngine.separate
-        PhysicsEngine.collision_handlers.append(handler)
-
-    @staticmethod
-    def add_to_space(position: tuple[float, float], body: pymunk.Body, shape: pymunk.Shape):
+    def apply_gravity(self, dt: float) -> None:
+        """ Vectorized planet_gravity for every body in gravity_bodies. Reads
+        all positions into one array and works out the inverse-square pull in
+        a single pass, so there's no Python callback per body inside
+        space.step().
+
+        The kick happens before the step instead of during it, which is still
+        semi-implicit Euler, just kick-then-drift. It goes through
+        Body.update_velocity() rather than setting body.velocity, since that
+        would wake the body up and reset its idle time, and nothing would ever
+        fall asleep. Sleeping bodies are skipped, like space.step() skips
+        their velocity_func.
+        """
+        bodies = [body for body in self.gravity_bodies if not body.is_sleeping]
+        if not bodies:
+            return
+        count = len(bodies)
+        positions = np.fromiter(chain.from_iterable(body.position for body in bodies),
+                                dtype=np.float64, count=count * 2).reshape(count, 2)
+        offsets = positions - self.GAME_CENTER
+        distance_squared = np.einsum('ij,ij->i', offsets, offsets)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scale = -GRAVITY_STRENGTH / (distance_squared * np.sqrt(distance_squared))
+        # A body sitting exactly on the center has no direction to fall in
+        scale[distance_squared == 0] = 0
+        update_velocity = pymunk.Body.update_velocity
+        for body, acceleration in zip(bodies, (offsets * scale[:, np.newaxis]).tolist()):
+            update_velocity(body, acceleration, 1.0, dt)
+
+    def add_collision_handler(self, kind_a: EntityKind, kind_b: EntityKind, colors: int):
+        """ Registers one handler per palette color, each matching only a
+        kind_a and a kind_b of that same color. Contacts between different
+        colors never reach Python.
+        """
+        for color_index in range(colors):
+            handler = self.space.add_collision_handler(get_collision_type(kind_a, color_index),
+                                                       get_collision_type(kind_b, color_index))
+            handler.begin = self.begin
+            handler.separate = self.separate
+            self.collision_handlers.append(handler)
+
+    def register_shape(self, shape: pymunk.Shape, kind: EntityKind, color_index: int = 0) -> int:
+        """ Gives the shape its collision type and filter, and an id that the
+        collision events refer to it by.
+        """
+        shape.collision_type = get_collision_type(kind, color_index)
+        shape.filter = get_filter(kind)
+        shape_id = len(self.shapes_by_id)
+        self.shapes_by_id.append(shape)
+        self.shape_ids[shape] = shape_id
+        return shape_id
+
+    def set_color(self, shape: pymunk.Shape, color_index: int) -> None:
+        kind, _ = split_collision_type(shape.collision_type)
+        shape.collision_type = get_collision_type(kind, color_index)
+
+    def get_shape(self, shape_id: int) -> pymunk.Shape:
+        return self.shapes_by_id[shape_id]
+
+    def add_to_space(self, position: tuple[float, float], body: pymunk.Body, shape: pymunk.Shape):
         body.position = list(position)
-        body.velocity_func = PhysicsEngine.planet_gravity
+        if body.body_type == pymunk.Body.DYNAMIC:
+            if self.vectorized_gravity:
+                self.gravity_bodies.append(body)
+            else:
+                body.velocity_func = self.planet_gravity
 
         # Setting the initial velocity and putting into orbit
-        r = body.position.get_distance((300, 300))
+        r = body.position.get_distance(self.GAME_CENTER)
         v = math.sqrt(GRAVITY_STRENGTH / r) / r
-        body.velocity = (body.position - PhysicsEngine.GAME_CENTER).perpendicular() * v
+        body.velocity = (body.position - self.GAME_CENTER).perpendicular() * v
 
         # Setting the angular velocity according to its orbital period
         body.angular_velocity = v
-        body.angle = math.atan2(body.position.y, body.position.x)
+        offset = body.position - self.GAME_CENTER
+        body.angle = math.atan2(offset.y, offset.x)
 
         # Setting the mass somewhere else instead of here will be best
         # shape.mass = 1
         shape.elasticity = 0.01
         shape.friction = 0.45
-        PhysicsEngine.space.add(body, shape)
+        self.space.add(body, shape)
 
-    @staticmethod
-    def create_walls(screen_size: tuple[int, int]):
+    def create_walls(self, screen_size: Optional[tuple[int, int]] = None):
         """ The body is already added to the space, since we access the given
-        static_body.
+        static_body. Defaults to walling in the whole world.
         """
+        if screen_size is None:
+            screen_size = self.WORLD_SIZE
         corners = BOX(screen_size[0], screen_size[1]).get_corners()
         for i in range(len(corners)):
             j = (i + 1) % len(corners)
-            segment = pymunk.Segment(PhysicsEngine.space.static_body, corners[i], corners[j], 1)
+            segment = pymunk.Segment(self.space.static_body, corners[i], corners[j], 1)
             segment.set_neighbors(corners[i], corners[j]) 
             segment.density = 100
             segment.elasticity = 0.999
             segment.friction = 0.49
-            PhysicsEngine.space.add(segment)
+            self.register_shape(segment, EntityKind.WALL)
+            self.space.add(segment)
 
-    @staticmethod
-    def attach_segments(vertices: list[tuple[float, float]], body: pymunk.Body):
+    def attach_segments(self, vertices: list[tuple[float, float]], body: pymunk.Body):
         """ Returns the line segments connecting all the passed vertices
         together, adding to the specified body and making all segments 
         neighbors. Effectively creates a non-filled polygon from line segments 
         for pymunk.
         """
         segment_list = []
-        PhysicsEngine.space.add(body)
+        self.space.add(body)
         for i in range(len(vertices)):
             j = i + 1 if i < len(vertices) - 1 else 0
             point_a = vertices[i][0], vertices[i][1]
@@ -107,24 +219,23 @@ class PhysicsEngine:
             segment.density = 100
             segment.elasticity = 1
             segment.friction = 0.7
-            segment.collision_type = 2  # TODO: more specific collision filters
+            segment.collision_type = get_collision_type(EntityKind.SIDE)
+            segment.filter = get_filter(EntityKind.SIDE)
             segment_list.append(segment)
-        PhysicsEngine.space.add(*segment_list)
+        self.space.add(*segment_list)
 
-    @staticmethod
-    def create_circle(radius: float) -> pymunk.Shape:
+    def create_circle(self, radius: float, position: tuple[float, float]) -> pymunk.Shape:
         mass = pymunk.area_for_circle(inner_radius=0, outer_radius=radius) * 2
         moment = pymunk.moment_for_circle(mass, inner_radius=0, outer_radius=radius)
         circle_body = pymunk.Body(mass, moment)
         circle_shape = pymunk.Circle(circle_body, radius)
-        PhysicsEngine.add_to_space(circle_body, circle_shape)
+        self.add_to_space(position, circle_body, circle_shape)
         return circle_shape
 
-    @staticmethod
-    def create_poly(points: list[tuple[float, float]], 
+    def create_poly(self, points: list[tuple[float, float]], 
                     center_position: tuple[float, float],
                     angular_velocity: float) -> pymunk.Shape:
-        # TODO: Alter the way that bodies for sides are created ? So not every side segment has its own body
+        # One body per polygon. Ring sides should go through create_ring() instead.
         mass = pymunk.area_for_poly(points)
         moment = pymunk.moment_for_poly(mass, points)
         side_body = pymunk.Body(mass, moment, pymunk.Body.KINEMATIC)
@@ -132,43 +243,237 @@ class PhysicsEngine:
         side_shape = pymunk.Poly(body=side_body, 
                                  vertices=points,
                                  radius=1)
-        PhysicsEngine.add_to_space(center_position, side_body, side_shape)
+        self.add_to_space(center_position, side_body, side_shape)
         return side_shape
 
-    @staticmethod
-    def get_points(shape: pymunk.Shape) -> list[tuple[float, float]]:
+    def create_ring(self, quads: np.ndarray,
+                    center_position: tuple[float, float],
+                    angular_velocity: float,
+                    color_indices: Optional[list[int]] = None) -> tuple[pymunk.Body, list[pymunk.Shape]]:
+        """ Builds a whole ring on a single kinematic body sitting on
+        center_position. quads is the (N, 4, 2) array from ring_quads(), in
+        coordinates relative to the center, and each quad becomes one side
+        shape on that body. The ring spins as one, so changing its speed is a
+        single angular_velocity update on the returned body.
+
+        color_indices gives each side its palette color for collision
+        matching, all sides are color 0 without it.
+        """
+        ring_body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
+        ring_body.position = tuple(center_position)
+        ring_body.angular_velocity = angular_velocity
+        side_shapes = []
+        for i, quad in enumerate(quads.tolist()):
+            side_shape = pymunk.Poly(body=ring_body, vertices=quad, radius=1)
+            side_shape.elasticity = 1
+            side_shape.friction = 0.7
+            self.register_shape(side_shape, EntityKind.SIDE,
+                                color_indices[i] if color_indices is not None else 0)
+            side_shapes.append(side_shape)
+        self.space.add(ring_body, *side_shapes)
+        self.ring_bodies.append(ring_body)
+        self.previous_state[ring_body] = (ring_body.position, ring_body.angle)
+        self.built_at[ring_body] = self.steps
+        return ring_body, side_shapes
+
+    def rebuild_ring(self, ring_body: pymunk.Body,
+                     side_shapes: list[pymunk.Shape],
+                     quads: np.ndarray,
+                     center_position: tuple[float, float],
+                     angular_velocity: float,
+                     color_indices: Optional[list[int]] = None) -> None:
+        """ Puts a ring taken out with remove_ring() back into the space with
+        new geometry, speed and colors, reusing its body and side shapes
+        (and their collision ids). quads needs one quad per side shape.
+        """
+        for i, (side_shape, quad) in enumerate(zip(side_shapes, quads.tolist())):
+            side_shape.unsafe_set_vertices(quad)
+            self.set_color(side_shape, color_indices[i] if color_indices is not None else 0)
+        ring_body.position = tuple(center_position)
+        ring_body.angle = 0
+        ring_body.angular_velocity = angular_velocity
+        self.space.add(ring_body, *side_shapes)
+        self.ring_bodies.append(ring_body)
+        self.previous_state[ring_body] = (ring_body.position, ring_body.angle)
+        self.built_at[ring_body] = self.steps
+
+    def freeze_ring(self, ring_body: pymunk.Body, duration: float) -> None:
+        """ Stops the ring for duration simulated seconds by turning its body
+        static. Static bodies aren't integrated and their shapes aren't
+        re-indexed every step, so a frozen ring costs the solver nothing
+        until thaw_ring() turns it back. Freezing a frozen ring just moves
+        its thaw time.
+        """
+        if ring_body in self.frozen:
+            self.timers.reschedule(self.frozen[ring_body][0], duration)
+            return
+        thaw = self.timers.schedule(duration, self.thaw_ring, ring_body)
+        self.frozen[ring_body] = (thaw, ring_body.angular_velocity)
+        ring_body.body_type = pymunk.Body.STATIC
+
+    def thaw_ring(self, ring_body: pymunk.Body) -> None:
+        thaw, angular_velocity = self.frozen.pop(ring_body)
+        self.timers.cancel(thaw)
+        ring_body.body_type = pymunk.Body.KINEMATIC
+        ring_body.angular_velocity = angular_velocity
+        if self.events is not None:
+            self.events.post(GameEvent.RING_THAWED, ring_body)
+
+    def is_frozen(self, ring_body: pymunk.Body) -> bool:
+        return ring_body in self.frozen
+
+    def get_frozen_time(self, ring_body: pymunk.Body) -> float:
+        """ Seconds until ring_body thaws, 0 if it isn't frozen. """
+        if ring_body not in self.frozen:
+            return 0.0
+        return self.timers.get_remaining(self.frozen[ring_body][0])
+
+    def remove_ring(self, ring_body: pymunk.Body) -> None:
+        """ Takes the ring and whatever sides it has left out of the space.
+        The body and shapes are left intact for rebuild_ring().
+        """
+        if ring_body in self.frozen:
+            self.thaw_ring(ring_body)
+        remaining = [shape for shape in ring_body.shapes if shape.space is not None]
+        if remaining:
+            self.space.remove(*remaining)
+        if ring_body.space is not None:
+            self.space.remove(ring_body)
+        if ring_body in self.ring_bodies:
+            self.ring_bodies.remove(ring_body)
+        self.previous_state.pop(ring_body, None)
+        self.built_at.pop(ring_body, None)
+
+    def remove_side(self, side_shape: pymunk.Shape) -> None:
+        """ Breaks one side off its ring. The ring body goes too once it has no
+        sides left.
+        """
+        ring_body = side_shape.body
+        self.space.remove(side_shape)
+        # body.shapes keeps shapes that were only removed from the space
+        if all(shape.space is None for shape in ring_body.shapes):
+            self.space.remove(ring_body)
+            if ring_body in self.ring_bodies:
+                self.ring_bodies.remove(ring_body)
+
+    def remove_side_later(self, side_shape: pymunk.Shape) -> None:
+        """ remove_side() that's safe to call from a collision callback. While
+        the space is stepping it waits for the step to finish.
+        """
+        if self.stepping:
+            self.space.add_post_step_callback(self.post_step_remove_side, side_shape)
+        elif side_shape.space is not None:
+            self.remove_side(side_shape)
+
+    def post_step_remove_side(self, space: pymunk.Space, side_shape: pymunk.Shape) -> None:
+        if side_shape.space is not None:
+            self.remove_side(side_shape)
+
+    def get_points(self, shape: pymunk.Shape) -> list[tuple[float, float]]:
         return shape.get_vertices()
 
-    @staticmethod
-    def get_centroid(shape: pymunk.Shape) -> tuple[float, float]:
+    def get_centroid(self, shape: pymunk.Shape) -> tuple[float, float]:
         return shape.center_of_gravity
 
     
-    @staticmethod
-    def begin(arbiter: pymunk.Arbiter, space: pymunk.Space, data: dict):
-        print('begin')
-        PhysicsEngine.notify_game('collision_begin', {'arbiter': arbiter})
-        
-    @staticmethod
-    def pre_solve(arbiter: pymunk.Arbiter, space: pymunk.Space, data: dict):
-        print('pre_solve')
-        PhysicsEngine.notify_game('collision_pre_solve', {'arbiter': arbiter})
-
-    @staticmethod
-    def post_solve(arbiter: pymunk.Arbiter, space: pymunk.Space, data: dict):
-        print('post_solve')
-        PhysicsEngine.notify_game('collision_post_solve', {'arbiter': arbiter})
-    
-    @staticmethod
-    def separate(arbiter: pymunk.Arbiter, space: pymunk.Space, data: dict):
-        """ Remove the side hit from the space if data indicates the correct
-        conditions were met.
-        """
-        print('separate')
-        PhysicsEngine.notify_game('collision_separate', {'arbiter': arbiter})
-        side_shape = arbiter.shapes[0]
-        PhysicsEngine.space.remove(side_shape)
-        
-    @staticmethod
-    def step_by(dt: float):
-        PhysicsEngine.space.step(dt)
+    def begin(self, arbiter: pymunk.Arbiter, space: pymunk.Space, data: dict) -> bool:
+        shape_a, shape_b = arbiter.shapes
+        points = arbiter.contact_point_set.points
+        x, y = points[0].point_a if points else (math.nan, math.nan)
+        if self.events is not None:
+            self.events.post(GameEvent.COLLISION_BEGIN, self.shape_ids.get(shape_b, -1),
+                             shape_b.collision_type, x, y)
+            return True
+        self.collisions.record(CollisionPhase.BEGIN,
+                               shape_a.collision_type, shape_b.collision_type,
+                               self.shape_ids.get(shape_a, -1), self.shape_ids.get(shape_b, -1),
+                               x, y)
+        return True
+
+    def separate(self, arbiter: pymunk.Arbiter, space: pymunk.Space, data: dict) -> None:
+        """ Only recorded (or posted). Whoever gets the events decides whether
+        the side breaks, and removes it with remove_side_later().
+        """
+        shape_a, shape_b = arbiter.shapes
+        if self.events is not None:
+            self.events.post(GameEvent.COLLISION_SEPARATE, self.shape_ids.get(shape_b, -1),
+                             shape_b.collision_type, math.nan, math.nan)
+            return
+        self.collisions.record(CollisionPhase.SEPARATE,
+                               shape_a.collision_type, shape_b.collision_type,
+                               self.shape_ids.get(shape_a, -1), self.shape_ids.get(shape_b, -1),
+                               math.nan, math.nan)
+
+    def drain_collisions(self) -> np.ndarray:
+        """ Every collision event since the last call, as one EVENT_DTYPE array. """
+        return self.collisions.drain()
+
+    def attach(self, asset: Asset, body: pymunk.Body) -> None:
+        """ Have sync() move the asset along with the body. """
+        self.attached[body] = asset
+        self.previous_state[body] = (body.position, body.angle)
+
+    def remove_body(self, body: pymunk.Body) -> None:
+        """ Take a body and all of its shapes out of the space. """
+        if body in self.gravity_bodies:
+            self.gravity_bodies.remove(body)
+        self.attached.pop(body, None)
+        self.previous_state.pop(body, None)
+        self.space.remove(body, *body.shapes)
+
+    def step(self, dt: float) -> None:
+        self.step_space(dt)
+        self.timers.advance(dt)
+
+    def step_space(self, dt: float) -> None:
+        """ step() without the timers. PhysicsThread steps with this and fires
+        the timers on the game's thread instead.
+        """
+        if self.vectorized_gravity:
+            self.apply_gravity(dt)
+        self.stepping = True
+        try:
+            self.space.step(dt)
+        finally:
+            self.stepping = False
+        self.steps += 1
+
+    def save_previous_state(self) -> None:
+        for body in chain(self.attached, self.ring_bodies):
+            self.previous_state[body] = (body.position, body.angle)
+
+    def step_by(self, frame_time: float) -> float:
+        """ Advance the simulation by frame_time seconds of real time, in
+        fixed steps of timestep.dt. Returns the interpolation alpha to pass to
+        sync().
+        """
+        steps = self.timestep.advance(frame_time)
+        for i in range(steps):
+            # Only the state right before the last step is needed to interpolate
+            if i == steps - 1:
+                self.save_previous_state()
+            self.step(self.timestep.dt)
+        return self.timestep.alpha
+
+    def interpolate(self, body: pymunk.Body, alpha: float) -> tuple[pymunk.Vec2d, float]:
+        """ Position and angle of the body alpha of the way from its previous
+        step to its current one.
+        """
+        position, angle = self.previous_state.get(body, (body.position, body.angle))
+        return (position.interpolate_to(body.position, alpha),
+                angle + (body.angle - angle) * alpha)
+
+    def sync(self, alpha: float) -> None:
+        """ Move every attached asset to its body's interpolated position. """
+        for body, asset in self.attached.items():
+            position, _ = self.interpolate(body, alpha)
+            asset.position = [position.x, position.y]
+            asset.rect.center = asset.position
+
+    def run(self, steps: int, dt: float) -> int:
+        """ Step the space a fixed number of times without touching pygame at
+        all. Returns the number of steps taken, handy for steps/second math.
+        """
+        for _ in range(steps):
+            self.step(dt)
+        return steps
@@ -0,0 +1,173 @@
+""" The physics stepped on a worker thread at its fixed rate, with the body
+states the renderer needs published as a double-buffered NumPy snapshot.
+"""
+import threading
+import time
+from itertools import chain
+from typing import Optional
+
+import numpy as np
+import pymunk
+
+from physics import PhysicsEngine
+
+# Columns of a snapshot row: the body before the last step, then after it
+BEFORE, AFTER = slice(0, 3), slice(3, 6)
+
+
+def read_states(bodies: tuple[pymunk.Body, ...], out: np.ndarray) -> None:
+    """ x, y and angle of every body into the rows of out. """
+    count = len(bodies)
+    out[:] = np.fromiter(chain.from_iterable((*body.position, body.angle) for body in bodies),
+                         dtype=np.float64, count=count * 3).reshape(count, 3)
+
+
+class StateSnapshot:
+    """ Two buffers of body states. The worker fills the back one and then
+    flips front to it, readers copy the front one without taking any lock.
+
+    The buffer a reader is copying can only be written again once the worker
+    has flipped away from it, which bumps version, so read() just retries the
+    (rare, the copy takes microseconds and a step milliseconds) copy that
+    version changed under.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.buffers = [np.zeros((capacity, 6)), np.zeros((capacity, 6))]
+        self.rows: list[dict[pymunk.Body, int]] = [{}, {}]  # body -> its row
+        self.counts = [0, 0]
+        self.times = [0.0, 0.0]  # perf_counter() when each was published
+        self.steps = [0, 0]  # PhysicsEngine.steps as of each
+        self.front = 0
+        self.version = 0
+
+    def get_back(self, count: int) -> np.ndarray:
+        """ The first count rows of the buffer to write next. """
+        back = 1 - self.front
+        if len(self.buffers[back]) < count:
+            self.buffers[back] = np.zeros((count * 2, 6))
+        return self.buffers[back][:count]
+
+    def publish(self, rows: dict[pymunk.Body, int], count: int, step_time: float, steps: int = 0) -> None:
+        back = 1 - self.front
+        self.rows[back] = rows
+        self.counts[back] = count
+        self.times[back] = step_time
+        self.steps[back] = steps
+        self.front = back
+        self.version += 1
+
+    def read(self) -> tuple[dict[pymunk.Body, int], np.ndarray, float, int]:
+        """ The rows, a copy of the states, the publish time and the step
+        count of the latest snapshot.
+        """
+        while True:
+            version = self.version
+            front = self.front
+            rows, step_time, steps = self.rows[front], self.times[front], self.steps[front]
+            states = self.buffers[front][:self.counts[front]].copy()
+            if version == self.version:
+                return rows, states, step_time, steps
+
+
+class PhysicsThread:
+    """ Steps engine on its own thread, timestep.dt at a time at
+    timestep.rate, so the space steps while the game draws. Pymunk steps in
+    C and SDL blits, both without the GIL, so the two really do overlap.
+
+    Anything else that changes the space (spawning and culling rings,
+    freezing them, draining the events the steps posted) holds lock while it
+    does, the worker holds it for each step. Drawing doesn't need it: sync()
+    reads the snapshot. Timers (and so their callbacks) stay on the game's
+    thread too, the worker only adds up the simulated time and
+    advance_timers() spends it.
+    """
+
+    def __init__(self, engine: PhysicsEngine):
+        self.engine = engine
+        self.snapshot = StateSnapshot()
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        # The bodies in the snapshot, and their rows
+        self.bodies: tuple[pymunk.Body, ...] = ()
+        self.rows: dict[pymunk.Body, int] = {}
+        self.elapsed = 0.0  # simulated time the timers haven't been told about
+        self.steps = 0
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None
+
+    def start(self) -> None:
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self.run, name='physics', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread is not None:
+            self.stopping.set()
+            self.thread.join()
+            self.thread = None
+
+    def run(self) -> None:
+        timestep = self.engine.timestep
+        deadline = time.perf_counter()
+        while not self.stopping.is_set():
+            with self.lock:
+                self.step(timestep.dt)
+            deadline += timestep.dt
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                self.stopping.wait(delay)
+            elif delay < -timestep.max_steps * timestep.dt:
+                # Too far behind to catch up, that time is dropped like step_by() would
+                timestep.dropped_time -= delay
+                deadline = time.perf_counter()
+
+    def step(self, dt: float) -> None:
+        """ One step, with the states before and after it published. Call
+        with lock held.
+        """
+        engine = self.engine
+        bodies = (*engine.attached, *engine.ring_bodies)
+        if bodies != self.bodies:
+            self.bodies = bodies
+            self.rows = {body: row for row, body in enumerate(bodies)}
+        states = self.snapshot.get_back(len(bodies))
+        read_states(bodies, states[:, BEFORE])
+        engine.step_space(dt)
+        read_states(bodies, states[:, AFTER])
+        self.elapsed += dt
+        self.steps += 1
+        self.snapshot.publish(self.rows, len(bodies), time.perf_counter(), engine.steps)
+
+    def advance_timers(self) -> int:
+        """ Fire the timers that came due during the steps since the last
+        call, on this thread. Call with lock held.
+        """
+        elapsed, self.elapsed = self.elapsed, 0.0
+        return self.engine.timers.advance(elapsed)
+
+    def sync(self, now: Optional[float] = None) -> tuple[dict[pymunk.Body, int], list[list[float]]]:
+        """ Move every attached asset to its body's state as of now,
+        interpolated between the last two steps like PhysicsEngine.sync().
+        Returns the rows and [x, y, angle] states of all the bodies in the
+        snapshot, for whatever draws the rest. Ring bodies rebuilt since (a
+        culled ring's body reused for a new one) are left out of rows, their
+        states are the old ring's.
+        """
+        rows, states, step_time, steps = self.snapshot.read()
+        stale = [body for body, built_at in self.engine.built_at.items() if built_at >= steps]
+        if stale:
+            rows = {body: row for body, row in rows.items() if body not in stale}
+        if now is None:
+            now = time.perf_counter()
+        alpha = min(max((now - step_time) * self.engine.timestep.rate, 0.0), 1.0)
+        states = (states[:, BEFORE] + (states[:, AFTER] - states[:, BEFORE]) * alpha).tolist()
+        for body, asset in self.engine.attached.items():
+            row = rows.get(body)
+            if row is not None:
+                asset.position = states[row][:2]
+                asset.rect.center = asset.position
+        return rows, states
@@ -0,0 +1,116 @@
+""" Per-phase frame timing with a fixed-size history. """
+import csv
+import json
+from time import perf_counter_ns
+
+import numpy as np
+import pygame
+from pygame import Color, Font, Surface
+
+PHASES = ('input', 'sprites', 'hud', 'physics', 'draw', 'flip', 'pacing')
+INPUT, SPRITES, HUD, PHYSICS, DRAW, FLIP, PACING = range(len(PHASES))
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    """ Times each phase of a frame in nanoseconds. Call begin_frame(), then
+    lap(phase) at the end of each phase (the time since the previous lap goes
+    to that phase), then end_frame(). The last history frames are kept in a
+    ring buffer, so memory never grows however long the game runs.
+
+    The game only makes these calls when it has a profiler at all, so a
+    disabled profiler costs one 'is not None' check per phase.
+    """
+
+    def __init__(self, history: int = 600):
+        self.history = history
+        self.samples = np.zeros((history, len(PHASES)), dtype=np.int64)
+        self.frames = 0
+        self.current = [0] * len(PHASES)
+        self.last = 0
+        self.overlay_image = None
+        self.overlay_frame = -1
+
+    def begin_frame(self) -> None:
+        self.current = [0] * len(PHASES)
+        self.last = perf_counter_ns()
+
+    def lap(self, phase: int) -> None:
+        now = perf_counter_ns()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self) -> None:
+        self.samples[self.frames % self.history] = self.current
+        self.frames += 1
+
+    def get_samples_ms(self) -> np.ndarray:
+        """ (frames, phases) timings in milliseconds, oldest frame first. """
+        if self.frames <= self.history:
+            samples = self.samples[:self.frames]
+        else:
+            samples = np.roll(self.samples, -(self.frames % self.history), axis=0)
+        return samples / 1e6
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """ p50/p95/p99 in milliseconds for every phase and the whole frame. """
+        samples = self.get_samples_ms()
+        if not len(samples):
+            return {}
+        columns = dict(zip(PHASES, samples.T))
+        columns['frame'] = samples.sum(axis=1)
+        return {name: {f'p{p}': float(value) for p, value in zip(PERCENTILES, np.percentile(column, PERCENTILES))}
+                for name, column in columns.items()}
+
+    def export(self, filename: str) -> None:
+        """ Writes the report to .json, or every frame in history to .csv. """
+        if filename.endswith('.csv'):
+            with open(filename, 'w', newline='') as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(PHASES)
+                writer.writerows(self.get_samples_ms().round(4).tolist())
+        else:
+            with open(filename, 'w') as json_file:
+                json.dump({'frames': self.frames, 'history': self.history, 'phases': self.report()},
+                          json_file, indent=4)
+
+    def draw_overlay(self, surface: Surface, font: Font, position: tuple[int, int] = (10, 10),
+                     refresh: int = 30) -> pygame.Rect:
+        """ Draws p50/p95 per phase in the corner. The text is only rebuilt
+        every refresh frames. Returns the rect it covered.
+        """
+        if self.overlay_image is None or self.frames - self.overlay_frame >= refresh:
+            self.overlay_frame = self.frames
+            lines = [f'{name:<8} {stats["p50"]:6.2f} {stats["p95"]:6.2f} ms'
+                     for name, stats in self.report().items()]
+            line_height = font.get_linesize()
+            width = max((font.size(line)[0] for line in lines), default=0)
+            self.overlay_image = Surface((width, line_height * len(lines)))
+            self.overlay_image.set_colorkey([0, 0, 0])
+            for i, line in enumerate(lines):
+                self.overlay_image.blit(font.render(line, False, Color('white')), (0, i * line_height))
+        return surface.blit(self.overlay_image, position)
+
+
+class StartupTimer:
+    """ Time to first frame, split into phases. mark(phase) at the end of each
+    phase gives it the time since the previous mark. start (and now) are
+    perf_counter_ns() values, so phases that ran before the timer existed,
+    like the imports of the module that makes it, can still be counted.
+    """
+
+    def __init__(self, start: int = None):
+        self.start = perf_counter_ns() if start is None else start
+        self.last = self.start
+        self.phases: dict[str, int] = {}
+
+    def mark(self, phase: str, now: int = None) -> None:
+        now = perf_counter_ns() if now is None else now
+        self.phases[phase] = self.phases.get(phase, 0) + now - self.last
+        self.last = now
+
+    def report(self) -> dict[str, float]:
+        """ Milliseconds per phase, in the order they ran, plus the total. """
+        report = {phase: elapsed / 1e6 for phase, elapsed in self.phases.items()}
+        report['total'] = (self.last - self.start) / 1e6
+        return report
@@ -0,0 +1 @@
+from src.renderer.renderer import DirtyRectRenderer
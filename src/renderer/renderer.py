@@ -0,0 +1,105 @@
+from itertools import chain
+from typing import Hashable, Optional
+
+import pygame
+from pygame import Rect, FRect, Surface
+
+
+class DirtyRectRenderer:
+    """ Only pushes the parts of the screen that changed to the display.
+
+    Everything drawn through the renderer is remembered by key along with the
+    rect it covered. Next frame, erase() paints the background back over those
+    rects, and present() updates just the old and new rects on the display.
+    When the changed area is more than threshold of the screen, a plain
+    display.flip() is cheaper, so that's what present() does instead.
+    """
+
+    def __init__(self, screen: Surface, background: Surface, threshold: float = 0.4):
+        self.screen = screen
+        self.background = background
+        self.threshold = threshold
+        self.screen_rect = screen.get_rect()
+        self.previous_rects: dict[Hashable, Rect] = {}
+        self.current_rects: dict[Hashable, Rect] = {}
+        self.full_redraw = True
+        self.flips = 0
+        self.partial_updates = 0
+
+    def invalidate(self) -> None:
+        """ Repaint and flip the whole screen next frame, e.g. after a resize. """
+        self.full_redraw = True
+
+    def erase(self) -> None:
+        """ Start a new frame by restoring the background wherever something
+        was drawn last frame.
+        """
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            self.screen.blits([(self.background, rect, rect) for rect in self.previous_rects.values()],
+                              doreturn=False)
+        self.current_rects = {}
+
+    def mark(self, key: Hashable, rect: Optional[Rect | FRect]) -> None:
+        """ Record that key covered rect this frame. None means nothing was
+        drawn for key, so only its old rect (if any) needs updating.
+        """
+        if rect is None:
+            return
+        rect = Rect(rect).inflate(2, 2).clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.current_rects[key] = rect
+
+    def draw_group(self, group: pygame.sprite.AbstractGroup) -> None:
+        """ Same as group.draw(screen), marking every sprite it blitted. """
+        sprites = group.sprites()
+        rects = self.screen.blits([(sprite.image, sprite.rect) for sprite in sprites])
+        for sprite, rect in zip(sprites, rects):
+            self.mark(sprite, rect)
+
+    def draw_layer(self, key: Hashable, areas: list[tuple[Surface, Rect, Rect]], changed: list[Rect]) -> None:
+        """ Draws a mostly static layer (like the HUD), given as blits()
+        arguments: (image, screen rect, area of image). Only the parts that
+        were erased or drawn over this frame are blitted again, and only the
+        changed rects are marked for the display.
+        """
+        if self.full_redraw:
+            self.screen.blits(areas, doreturn=False)
+        else:
+            others = list(chain(self.previous_rects.values(), self.current_rects.values(), changed))
+            blits = []
+            for image, rect, area in areas:
+                for clipped in (other.clip(rect) for other in others):
+                    if clipped.width and clipped.height:
+                        blits.append((image, clipped,
+                                      Rect(area.x + clipped.x - rect.x, area.y + clipped.y - rect.y,
+                                           clipped.width, clipped.height)))
+            self.screen.blits(blits, doreturn=False)
+        for changed_rect in changed:
+            self.mark((key, tuple(changed_rect)), changed_rect)
+
+    def get_dirty_rects(self) -> list[Rect]:
+        dirty = list(self.current_rects.values())
+        for key, rect in self.previous_rects.items():
+            if self.current_rects.get(key) != rect:
+                dirty.append(rect)
+        return dirty
+
+    def present(self) -> list[Rect]:
+        """ Push this frame to the display. Returns the rects that were updated,
+        which is the whole screen on a full flip.
+        """
+        dirty = self.get_dirty_rects()
+        dirty_area = sum(rect.width * rect.height for rect in dirty)
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        if self.full_redraw or dirty_area > self.threshold * screen_area:
+            pygame.display.flip()
+            self.flips += 1
+            dirty = [self.screen_rect]
+        else:
+            pygame.display.update(dirty)
+            self.partial_updates += 1
+        self.full_redraw = False
+        self.previous_rects = self.current_rects
+        return dirty
@@ -0,0 +1,106 @@
+""" Timers on the simulation clock, kept in a min-heap of deadlines. """
+import heapq
+from itertools import count
+from typing import Callable, Optional
+
+
+class Timer:
+    """ One scheduled callback. Only TimerScheduler makes and changes these,
+    hold on to them to cancel, reschedule or ask how long is left.
+    """
+
+    __slots__ = ('deadline', 'callback', 'args', 'entry')
+
+    def __init__(self, deadline: float, callback: Optional[Callable], args: tuple):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.entry: Optional[list] = None  # its current heap entry, None once fired or cancelled
+
+    @property
+    def active(self) -> bool:
+        return self.entry is not None
+
+
+class TimerScheduler:
+    """ Fires callbacks once the simulation clock reaches their deadline.
+
+    advance(dt) moves the clock and pops every due timer off the heap, so a
+    frame where nothing is due costs one comparison however many timers are
+    waiting, and each timer costs O(log n) to schedule and fire. Cancelling
+    just forgets the heap entry, which is thrown away when it comes up or
+    when cancelled entries outnumber the live ones (rescheduling is a cancel
+    plus a new entry). A timer with no callback is a plain countdown, for
+    get_remaining().
+    """
+
+    def __init__(self):
+        self.time = 0.0
+        self.heap: list[list] = []  # [deadline, order scheduled, timer]
+        self.order = count()
+        self.active = 0
+
+    def __len__(self) -> int:
+        return self.active
+
+    def schedule(self, delay: float, callback: Optional[Callable] = None, *args) -> Timer:
+        """ Call callback(*args) delay simulated seconds from now. """
+        return self.schedule_at(self.time + delay, callback, *args)
+
+    def schedule_at(self, deadline: float, callback: Optional[Callable] = None, *args) -> Timer:
+        timer = Timer(deadline, callback, args)
+        self.push(timer)
+        return timer
+
+    def push(self, timer: Timer) -> None:
+        timer.entry = [timer.deadline, next(self.order), timer]
+        heapq.heappush(self.heap, timer.entry)
+        self.active += 1
+
+    def cancel(self, timer: Timer) -> None:
+        """ Stop timer from firing. Cancelling a fired timer does nothing. """
+        if timer.entry is not None:
+            timer.entry[2] = None
+            timer.entry = None
+            self.active -= 1
+            # Drop the cancelled entries once they're most of the heap
+            if len(self.heap) > 2 * self.active + 64:
+                # In place, advance() may be looping over this very list
+                self.heap[:] = [entry for entry in self.heap if entry[2] is not None]
+                heapq.heapify(self.heap)
+
+    def reschedule(self, timer: Timer, delay: float) -> None:
+        """ Move timer to delay seconds from now, even if it already fired. """
+        self.cancel(timer)
+        timer.deadline = self.time + delay
+        self.push(timer)
+
+    def get_remaining(self, timer: Timer) -> float:
+        """ Simulated seconds until timer fires, 0 once it has. """
+        return max(timer.deadline - self.time, 0.0) if timer.entry is not None else 0.0
+
+    def advance(self, dt: float) -> int:
+        """ Move the clock on by dt and fire everything that's due, earliest
+        first. Callbacks can schedule more timers; ones due already fire in
+        this same call. Returns how many fired.
+        """
+        self.time += dt
+        fired = 0
+        heap = self.heap
+        while heap and heap[0][0] <= self.time:
+            _, _, timer = heapq.heappop(heap)
+            if timer is None:
+                continue  # cancelled
+            timer.entry = None
+            self.active -= 1
+            fired += 1
+            if timer.callback is not None:
+                timer.callback(*timer.args)
+        return fired
+
+    def clear(self) -> None:
+        for entry in self.heap:
+            if entry[2] is not None:
+                entry[2].entry = None
+        self.heap.clear()
+        self.active = 0
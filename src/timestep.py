@@ -0,0 +1,41 @@
+""" Fixed-rate stepping for the physics, decoupled from the frame rate. """
+
+# Slack for float error when a frame is an exact multiple of the step (1/60 vs 1/120)
+EPSILON = 1e-9
+
+
+class FixedTimestep:
+    """ Accumulates real frame time and hands back how many fixed-size steps
+    the physics should take this frame. Whatever doesn't fill a whole step is
+    carried over, and alpha says how far we are into the next one so sprites
+    can be drawn in between the last two states.
+
+    A slow frame can only ever cost max_steps steps. Anything past that is
+    dropped (and counted in dropped_time) instead of snowballing into the next
+    frame.
+    """
+
+    def __init__(self, rate: float = 120, max_steps: int = 5):
+        self.rate = rate
+        self.dt = 1 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.dropped_time = 0.0
+
+    def advance(self, frame_time: float) -> int:
+        """ Add frame_time (in seconds) and return the number of steps due. """
+        self.accumulator += max(frame_time, 0.0)
+        steps = int((self.accumulator + EPSILON) / self.dt)
+        if steps > self.max_steps:
+            self.dropped_time += (steps - self.max_steps) * self.dt
+            self.accumulator -= (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+        self.accumulator = max(self.accumulator - steps * self.dt, 0.0)
+        self.alpha = min(self.accumulator / self.dt, 1.0)
+        return steps
+
+    def reset(self) -> None:
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.dropped_time = 0.0
@@ -0,0 +1,118 @@
+import pygame
+from pygame import Color
+
+from asset import Asset, RotationCache, SpriteCache
+from asset.shape import BOX, CIRCLE, POLY, REG_POLY
+
+
+def test_same_shape_and_color_share_an_image():
+    Asset.sprite_cache.clear()
+    first = Asset([], REG_POLY(6, 40), Color('red'), (0, 0))
+    second = Asset([], REG_POLY(6, 40), Color('red'), (100, 100))
+    other = Asset([], REG_POLY(6, 40), Color('blue'), (0, 0))
+    assert first.image is second.image
+    assert first.mask is second.mask
+    assert first.rect is not second.rect
+    assert other.image is not first.image
+    assert Asset.sprite_cache.get_stats()['hits'] == 1
+
+
+def test_writable_image_is_copied_once():
+    Asset.sprite_cache.clear()
+    first = Asset([], BOX(20, 10, 2), Color('white'), (0, 0))
+    second = Asset([], BOX(20, 10, 2), Color('white'), (0, 0))
+    image = first.get_writable_image()
+    image.fill(Color('red'))
+    assert first.get_writable_image() is image
+    assert second.image.get_at((10, 5)) == Color('white')
+
+
+def test_lru_eviction_respects_memory_cap():
+    cache = SpriteCache(max_bytes=2 * SpriteCache.get_size(pygame.Surface((20, 20))))
+    for radius in (10, 10.5, 11):
+        cache.get(CIRCLE(radius), Color('white'))
+    assert len(cache.entries) <= 2
+    assert cache.bytes <= cache.max_bytes
+    cache.get(CIRCLE(11), Color('white'))
+    assert cache.get_hit_rate() == 0.25
+
+
+def test_cache_key():
+    assert BOX(20, 10, 2).get_cache_key() == ('BOX', 20, 10, 2)
+    assert REG_POLY(5, 30).get_cache_key() != REG_POLY(6, 30).get_cache_key()
+
+
+def test_rotated_frames_are_shared_across_colors():
+    cache = RotationCache(frames=8)
+    side = POLY([(0, 0), (40, 0), (40, 10), (0, 10)])
+    frames = cache.get(side)
+    assert cache.get(side) is frames
+    assert cache.get_stats()['hits'] == 1
+    red, blue = frames.get_images(Color('red')), frames.get_images(Color('blue'))
+    assert len(red) == len(frames.masks) == 8
+    assert red[0].get_parent() is blue[0].get_parent() is frames.atlas
+    assert red[0].get_at((20, 5)) == Color('red')
+    assert blue[0].get_at((20, 5)) == Color('blue')
+
+
+def test_set_angle_picks_the_nearest_frame():
+    shared = Asset.rotation_cache
+    Asset.rotation_cache = RotationCache(frames=4)
+    try:
+        asset = Asset([], POLY([(0, 0), (40, 0), (40, 10), (0, 10)]), Color('white'), (100, 100))
+        asset.set_angle(0.1)
+        assert asset.frame == 0
+        assert asset.rect.size == (40, 10)
+        asset.set_angle(1.5)
+        assert asset.frame == 1
+        assert asset.rect.size == (10, 40)
+        assert asset.rect.center == (100, 100)
+        assert asset.mask.count() == 400
+    finally:
+        Asset.rotation_cache = shared
+
+
+def test_masks_are_made_on_demand():
+    Asset.sprite_cache.clear()
+    asset = Asset([], CIRCLE(10), Color('white'), (0, 0))
+    entry = Asset.sprite_cache.entries[SpriteCache.get_key(CIRCLE(10), Color('white'))]
+    assert entry[1] is None
+    assert asset.mask.get_at((10, 10))
+    assert entry[1] is asset.mask
+
+
+def test_drawing_on_the_image_invalidates_the_mask():
+    Asset.sprite_cache.clear()
+    asset = Asset([], BOX(20, 10, 2), Color('white'), (0, 0))
+    solid = asset.mask.count()
+    asset.get_writable_image().fill(Color('black'), (0, 0, 10, 10))
+    assert asset.mask.count() < solid
+    assert not asset.mask.get_at((5, 5))
+    assert Asset.sprite_cache.get_mask(BOX(20, 10, 2), Color('white')).count() == solid
+
+
+def test_non_colliding_assets_have_no_mask():
+    asset = Asset([], BOX(20, 10, 2), Color('white'), (0, 0), collides=False)
+    assert asset.mask is None
+
+
+def test_indexed_recolor_only_touches_the_palette():
+    Asset.sprite_cache.clear()
+    first = Asset([], CIRCLE(10), Color('red'), (0, 0), indexed=True)
+    second = Asset([], CIRCLE(10), Color('blue'), (0, 0), indexed=True)
+    assert first.image.get_parent() is second.image.get_parent()
+    assert first.image.get_at((10, 10)) == Color('red')
+    assert second.image.get_at((10, 10)) == Color('blue')
+    mask = first.mask
+    first.set_color(Color('green'))
+    assert first.image.get_at((10, 10)) == Color('green')
+    assert second.image.get_at((10, 10)) == Color('blue')
+    assert first.mask is mask is second.mask
+    assert Asset.sprite_cache.get_stats()['misses'] == 1
+
+
+def test_set_palette_takes_a_row():
+    asset = Asset([], CIRCLE(10), Color('red'), (0, 0), indexed=True)
+    asset.set_palette([Color('yellow'), Color('orange')])
+    assert asset.color == Color('yellow')
+    assert asset.image.get_palette_at(2) == Color('orange')
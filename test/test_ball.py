@@ -0,0 +1,59 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+import pygame
+from pygame import Color
+
+from ball import Ball, Slingshot
+from collision import EntityKind, get_collision_type
+from events import EventBus, GameEvent
+
+
+@pytest.fixture
+def ball():
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    screen = pygame.Surface((400, 300))
+    game = SimpleNamespace(screen=screen,
+                           CENTER=(200, 150),
+                           mouse_pos=(0, 0),
+                           PALETTE={'white': [Color('white')],
+                                    'red': [Color('red')],
+                                    'black': [Color(i, i, i) for i in range(0, 60, 10)]},
+                           all_entities=pygame.sprite.Group(),
+                           player_group=pygame.sprite.Group())
+    return Ball(game)
+
+
+def test_idle_line_only_covers_its_bounds(ball):
+    rect = ball.draw_slingshot(ball.game.screen)
+    assert rect is ball.slingshot_rect
+    assert rect.width * rect.height < 400 * 300
+    assert ball.game.screen.get_at(rect.center) != Color('black')
+
+
+def test_pull_back_is_red(ball):
+    ball.toggle_slingshot()
+    assert ball.slingshot == Slingshot.PULL_BACK
+    assert ball.get_slingshot_color() == Color('red')
+
+
+def test_release_draws_nothing(ball):
+    ball.slingshot = Slingshot.RELEASE
+    before = ball.game.screen.copy()
+    assert ball.draw_slingshot(ball.game.screen) is None
+    assert ball.game.screen.get_view().raw == before.get_view().raw
+
+
+def test_side_hits_score_through_the_event_bus(ball):
+    bus = EventBus()
+    ball.game.events = bus
+    ball = Ball(ball.game)
+    scores = []
+    bus.subscribe(GameEvent.SCORE_CHANGED, lambda event: scores.append(event.value))
+    bus.post(GameEvent.COLLISION_BEGIN, 4, get_collision_type(EntityKind.SIDE, 2))
+    bus.post(GameEvent.COLLISION_BEGIN, 5, get_collision_type(EntityKind.BALL, 2))
+    bus.dispatch()
+    assert ball.get_score() == 1
+    assert scores == [1]
@@ -0,0 +1,14 @@
+from benchmarks.suite import compare, measure
+
+
+def test_compare_flags_only_regressions_past_tolerance():
+    baseline = {'fast': {'best_ms': 1.0}, 'slow': {'best_ms': 1.0}, 'gone': {'best_ms': 1.0}}
+    results = {'fast': {'best_ms': 1.05}, 'slow': {'best_ms': 1.5}, 'new': {'best_ms': 9.0}}
+    assert compare(results, baseline, tolerance=0.10) == ['slow']
+
+
+def test_measure():
+    calls = []
+    result = measure(lambda: calls.append(1), number=4, repeat=2)
+    assert len(calls) == 9
+    assert result['best_ms'] <= result['median_ms']
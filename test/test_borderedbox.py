@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import pytest
+import pygame
+from pygame import Color
+
+from borderedbox import BorderedBox, TextCache
+
+
+@pytest.fixture
+def game():
+    pygame.font.init()
+    return SimpleNamespace(font=pygame.font.Font(None, 20),
+                           all_entities=pygame.sprite.Group(),
+                           HUD=pygame.sprite.Group(),
+                           screen=pygame.Surface((200, 100)))
+
+
+@pytest.fixture
+def box(game):
+    BorderedBox.text_cache.clear()
+    return BorderedBox(game, 'Score', Color('black'), Color('white'), 20, 100, 30, 5, (50, 50))
+
+
+def test_cache_hits_and_lru():
+    pygame.font.init()
+    font = pygame.font.Font(None, 20)
+    cache = TextCache(capacity=2)
+    first = cache.render(font, 'a', Color('white'))
+    assert cache.render(font, 'a', Color('white')) is first
+    cache.render(font, 'b', Color('white'))
+    cache.render(font, 'c', Color('white'))
+    assert cache.get_stats() == {'hits': 1, 'misses': 3, 'size': 2}
+    assert cache.render(font, 'a', Color('white')) is not first
+
+
+def test_unchanged_text_is_not_rendered_again(box):
+    box.set_text('10')
+    misses = BorderedBox.text_cache.misses
+    for _ in range(60):
+        box.set_text('10')
+    assert BorderedBox.text_cache.misses == misses
+
+
+def test_color_change_only_touches_the_palette(box):
+    image = box.asset.image
+    misses = BorderedBox.text_cache.misses
+    box.set_bg_color(Color('red'))
+    box.set_font_color(Color('blue'))
+    assert box.asset.image is image
+    assert image.get_at((1, 1)) == Color('red')
+    assert Color('blue') in [image.get_at((x, y)) for x in range(100) for y in range(30)]
+    assert BorderedBox.text_cache.misses == misses
+
+
+def test_box_uses_its_font_size(game):
+    small = BorderedBox(game, 'Score', Color('black'), Color('white'), 20, 100, 30, 5, (50, 50))
+    large = BorderedBox(game, 'Level', Color('black'), Color('white'), 40, 100, 30, 5, (50, 50))
+    assert large.font.get_height() > small.font.get_height()
+    assert BorderedBox(game, 'Clock', Color('black'), Color('white'), 20, 100, 30, 5, (0, 0)).font is small.font
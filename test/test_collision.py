@@ -0,0 +1,70 @@
+import math
+
+import pymunk
+import pytest
+
+from asset.geometry import ring_quads
+from collision import (CollisionBuffer, CollisionPhase, EntityKind,
+                       get_collision_type, split_collision_type)
+from physics import PhysicsEngine
+
+
+def launch_ball(engine, color_index):
+    ball = pymunk.Body(1, pymunk.moment_for_circle(1, 0, 5))
+    ball.position = engine.GAME_CENTER
+    ball.velocity = (400, 0)
+    shape = pymunk.Circle(ball, 5)
+    shape.elasticity = 1
+    engine.register_shape(shape, EntityKind.BALL, color_index)
+    engine.space.add(ball, shape)
+    return shape
+
+
+def run_into_ring(ball_color, side_color):
+    engine = PhysicsEngine(world_size=(800, 600))
+    engine.add_collision_handler(EntityKind.BALL, EntityKind.SIDE, colors=4)
+    _, sides = engine.create_ring(ring_quads(4, 50, 100), engine.GAME_CENTER, 0,
+                                  color_indices=[side_color] * 4)
+    ball = launch_ball(engine, ball_color)
+    engine.run(60, 1 / 120)
+    return engine, ball, sides
+
+
+def test_collision_type_round_trip():
+    collision_type = get_collision_type(EntityKind.SIDE, 5)
+    assert split_collision_type(collision_type) == (EntityKind.SIDE, 5)
+
+
+def test_matching_colors_are_recorded():
+    engine, ball, sides = run_into_ring(ball_color=1, side_color=1)
+    events = engine.drain_collisions()
+    assert list(events['phase'][:2]) == [CollisionPhase.BEGIN, CollisionPhase.SEPARATE]
+    begin = events[0]
+    assert engine.get_shape(begin['shape_a']) is ball
+    assert engine.get_shape(begin['shape_b']) in sides
+    assert not math.isnan(begin['x'])
+    assert len(engine.drain_collisions()) == 0
+
+
+def test_other_colors_bounce_without_events():
+    engine, ball, _ = run_into_ring(ball_color=1, side_color=2)
+    assert len(engine.drain_collisions()) == 0
+    assert ball.body.velocity.x < 0
+
+
+def test_buffer_drops_past_capacity():
+    buffer = CollisionBuffer(capacity=2)
+    for _ in range(3):
+        buffer.record(CollisionPhase.BEGIN, 1, 2, 0, 1, 0, 0)
+    assert buffer.dropped == 1
+    assert len(buffer.drain()) == 2
+
+
+def test_removal_is_deferred_during_step():
+    engine, _, sides = run_into_ring(ball_color=1, side_color=1)
+    engine.stepping = True
+    engine.remove_side_later(sides[0])
+    assert sides[0].space is engine.space
+    engine.stepping = False
+    engine.run(1, 1 / 120)
+    assert sides[0].space is None
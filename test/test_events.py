@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+import pymunk
+
+from asset.geometry import ring_quads
+from collision import EntityKind, get_collision_type
+from events import EventBus, GameEvent
+from movable.enemy import Enemy
+from physics import PhysicsEngine
+
+
+def test_publish_reaches_only_its_type():
+    bus = EventBus()
+    seen = []
+    bus.subscribe(GameEvent.SCORE_CHANGED, lambda event: seen.append(event.value))
+    bus.publish(GameEvent.SCORE_CHANGED, value=3)
+    bus.publish(GameEvent.RING_FROZEN, value=4)
+    assert seen == [3]
+
+
+def test_keyed_subscribers_only_get_their_key():
+    bus = EventBus()
+    seen = []
+    callback = lambda event: seen.append(event.key)
+    bus.subscribe(GameEvent.COLLISION_BEGIN, callback, key=7)
+    bus.publish(GameEvent.COLLISION_BEGIN, key=6)
+    bus.publish(GameEvent.COLLISION_BEGIN, key=7)
+    assert seen == [7]
+    bus.unsubscribe(GameEvent.COLLISION_BEGIN, callback, key=7)
+    bus.publish(GameEvent.COLLISION_BEGIN, key=7)
+    assert seen == [7]
+    assert bus.keyed[GameEvent.COLLISION_BEGIN] == {}
+
+
+def test_posted_events_wait_for_dispatch():
+    bus = EventBus(capacity=2)
+    seen = []
+    bus.subscribe(GameEvent.SIDE_BROKEN, lambda event: seen.append(event.key))
+    for key in range(5):
+        bus.post(GameEvent.SIDE_BROKEN, key)
+    assert seen == []
+    assert bus.dispatch() == 5
+    assert seen == [0, 1, 2, 3, 4]
+    assert bus.dispatch() == 0
+    assert len(bus.queue) == 8
+
+
+def test_records_are_reused():
+    bus = EventBus()
+    records = []
+    bus.subscribe(GameEvent.SCORE_CHANGED, records.append)
+    bus.publish(GameEvent.SCORE_CHANGED, value=1)
+    bus.publish(GameEvent.SCORE_CHANGED, value=2)
+    assert records[0] is records[1]
+    bus.post(GameEvent.SCORE_CHANGED, value=3)
+    queued = bus.queue[0]
+    bus.dispatch()
+    bus.post(GameEvent.SCORE_CHANGED, value=4)
+    assert bus.queue[0] is queued
+
+
+def test_callbacks_can_publish_and_post():
+    bus = EventBus()
+    seen = []
+    bus.subscribe(GameEvent.COLLISION_BEGIN,
+                  lambda event: bus.publish(GameEvent.SCORE_CHANGED, value=event.value))
+    bus.subscribe(GameEvent.SCORE_CHANGED, lambda event: seen.append(('score', event.value)))
+    bus.subscribe(GameEvent.SCORE_CHANGED, lambda event: bus.post(GameEvent.SIDE_BROKEN, event.value))
+    bus.subscribe(GameEvent.SIDE_BROKEN, lambda event: seen.append(('broken', event.key)))
+    bus.post(GameEvent.COLLISION_BEGIN, value=9)
+    assert bus.dispatch() == 2
+    assert seen == [('score', 9), ('broken', 9)]
+
+
+def test_engine_posts_collisions():
+    bus = EventBus()
+    engine = PhysicsEngine(world_size=(800, 600), events=bus)
+    engine.add_collision_handler(EntityKind.BALL, EntityKind.SIDE, colors=4)
+    _, sides = engine.create_ring(ring_quads(4, 50, 100), engine.GAME_CENTER, 0, color_indices=[1] * 4)
+    ball = pymunk.Body(1, pymunk.moment_for_circle(1, 0, 5))
+    ball.position = engine.GAME_CENTER
+    ball.velocity = (400, 0)
+    shape = pymunk.Circle(ball, 5)
+    shape.elasticity = 1
+    engine.register_shape(shape, EntityKind.BALL, 1)
+    engine.space.add(ball, shape)
+
+    hits = []
+    bus.subscribe(GameEvent.COLLISION_BEGIN, lambda event: hits.append((event.key, event.value)))
+    engine.run(60, 1 / 120)
+    assert hits == []  # posted mid-step, delivered on dispatch()
+    bus.dispatch()
+    side_id, collision_type = hits[0]
+    assert engine.get_shape(side_id) in sides
+    assert collision_type == get_collision_type(EntityKind.SIDE, 1)
+    assert len(engine.drain_collisions()) == 0
+
+
+def test_enemy_is_hit_through_its_shape_id():
+    bus = EventBus()
+    asset = SimpleNamespace(killed=False)
+    asset.kill = lambda: setattr(asset, 'killed', True)
+    enemy = Enemy(SimpleNamespace(events=bus), asset, shape_id=3)
+    bus.publish(GameEvent.COLLISION_BEGIN, key=2)
+    assert not asset.killed
+    bus.publish(GameEvent.COLLISION_BEGIN, key=3)
+    assert asset.killed
+    assert enemy.events is None
+    assert bus.keyed[GameEvent.COLLISION_BEGIN] == {}
@@ -0,0 +1,28 @@
+import pygame
+
+from fonts import FontManager
+
+
+def test_fonts_are_cached_per_file_and_size():
+    fonts = FontManager()
+    small = fonts.get(20)
+    assert fonts.get(20) is small
+    assert fonts.get(40) is not small
+    assert fonts.get(40).get_height() > small.get_height()
+    assert fonts.get(20, 'Emulogic-zrEw.ttf') is not small
+    assert len(fonts.fonts) == 3
+
+
+def test_bundled_font_is_loaded_from_its_file():
+    assert FontManager().get(20).name == 'monogram'
+
+
+def test_game_can_be_started_again_after_quitting(monkeypatch):
+    import benchmarks
+    from polybounce import PolyBounce
+    monkeypatch.chdir(benchmarks.SCRIPTS)
+    PolyBounce(seed=0).quit()
+    game = PolyBounce(seed=0)
+    game.process_game_logic()
+    game.render()
+    game.quit()
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from asset.geometry import unit_polygon, regular_polygon, ring_quads
+from asset.shape import REG_POLY
+
+
+def loop_vertices(N, radius, center):
+    theta = (2 * np.pi) / N
+    tilt = (np.pi - theta) / 2
+    return [(radius * np.cos(tilt + theta * i) + center[0],
+             radius * np.sin(tilt + theta * i) + center[1]) for i in range(1, N + 1)]
+
+
+@pytest.mark.parametrize('N', [3, 4, 7, 12])
+def test_matches_the_original_loop(N):
+    assert np.allclose(regular_polygon(N, 30, (5, 6)), loop_vertices(N, 30, (5, 6)))
+    assert np.allclose(REG_POLY(N, 30).get_vertices(), loop_vertices(N, 30, (30, 30)))
+
+
+def test_unit_polygon_is_cached_and_read_only():
+    assert unit_polygon(6) is unit_polygon(6)
+    with pytest.raises(ValueError):
+        unit_polygon(6)[0, 0] = 1
+
+
+def test_ring_quads():
+    quads = ring_quads(5, 50, 100, (10, 10))
+    assert quads.shape == (5, 4, 2)
+    assert quads.flags['C_CONTIGUOUS']
+    inner = regular_polygon(5, 50, (10, 10))
+    outer = regular_polygon(5, 100, (10, 10))
+    assert np.allclose(quads[1], [inner[1], outer[1], outer[2], inner[2]])
+    assert np.allclose(quads[4, 2], outer[0])
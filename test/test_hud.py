@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+import pygame
+from pygame import Color, Surface
+
+from borderedbox import BorderedBox, HUDCompositor
+
+
+@pytest.fixture
+def game():
+    pygame.font.init()
+    return SimpleNamespace(all_entities=pygame.sprite.Group(),
+                           HUD=pygame.sprite.Group(),
+                           screen=Surface((400, 200)))
+
+
+@pytest.fixture
+def values():
+    return {'score': 0, 'clock': 30}
+
+
+@pytest.fixture
+def hud(game, values):
+    hud = HUDCompositor()
+    for name, position in (('score', (60, 30)), ('clock', (340, 30))):
+        box = BorderedBox(game, name, Color('gray10'), Color('white'), 20, 100, 30, 5, position, groups=[])
+        hud.add(box, lambda name=name: values[name])
+    return hud
+
+
+def test_boxes_are_not_sprites(game, hud):
+    assert len(game.all_entities) == 0
+
+
+def test_first_update_draws_everything(hud):
+    assert hud.update() == [hud.rect]
+    assert hud.rect.width == 380
+
+
+def test_only_changed_boxes_are_redrawn(hud, values):
+    hud.update()
+    assert hud.update() == []
+    values['clock'] = 29
+    changed = hud.update()
+    assert changed == [pygame.Rect(hud.boxes[1].asset.rect)]
+    hud.boxes[0].set_bg_color(Color('red'))
+    assert hud.update() == [pygame.Rect(hud.boxes[0].asset.rect)]
+
+
+def test_draw_blits_the_layer(game, hud):
+    hud.draw(game.screen)
+    assert game.screen.get_at((20, 20)) == Color('gray10')
+    # The gap between the boxes is left alone
+    assert game.screen.get_at((200, 30)) == Color('black')
+
+
+def test_unpolled_boxes_wait_for_refresh(game, values):
+    hud = HUDCompositor()
+    box = BorderedBox(game, 'score', Color('gray10'), Color('white'), 20, 100, 30, 5, (60, 30), groups=[])
+    calls = []
+    hud.add(box, lambda: calls.append(values['score']) or values['score'], poll=False)
+    hud.update()
+    values['score'] = 5
+    assert hud.update() == []
+    assert calls == [0]
+    hud.refresh(box)
+    assert hud.update() == [pygame.Rect(box.asset.rect)]
+    assert calls == [0, 5]
@@ -0,0 +1,24 @@
+import os
+
+from pygame import Color
+
+from asset.palette import Palette, get_indexed_image, KEY, INK
+from asset.shape import CIRCLE
+
+PALETTE_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'palette.json')
+
+
+def test_palette_is_a_drop_in_for_the_dict():
+    palette = Palette.load(PALETTE_FILE)
+    assert palette['red'][0] == Color(255, 0, 34)
+    assert 'white' in palette.keys()
+    assert len(palette) == 9
+    assert palette.get_row('aqua', 3) == palette['aqua'][:3]
+
+
+def test_indexed_image_is_key_and_ink():
+    image = get_indexed_image(CIRCLE(10))
+    assert image.get_bitsize() == 8
+    assert image.get_at_mapped((10, 10)) == INK
+    assert image.get_at_mapped((0, 0)) == KEY
+    assert image.get_colorkey() == Color('black')
@@ -0,0 +1,153 @@
+import pygame
+import pymunk
+import pytest
+
+from asset import Asset
+from asset.geometry import ring_quads
+from asset.shape import CIRCLE
+from physics import PhysicsEngine
+
+
+@pytest.fixture
+def engine():
+    return PhysicsEngine(world_size=(800, 600))
+
+
+def test_headless_engine(engine):
+    assert engine.headless
+    assert engine.game is None
+    assert engine.GAME_CENTER == pymunk.Vec2d(400, 300)
+
+
+def test_custom_center():
+    engine = PhysicsEngine(center=(10, 20), world_size=(800, 600))
+    assert engine.GAME_CENTER == pymunk.Vec2d(10, 20)
+
+
+def test_engines_are_isolated():
+    first = PhysicsEngine(world_size=(800, 600))
+    second = PhysicsEngine(world_size=(800, 600))
+    first.create_circle(10, (500, 300))
+    assert len(first.space.bodies) == 1
+    assert len(second.space.bodies) == 0
+
+
+def test_run_orbits_center(engine):
+    shape = engine.create_circle(10, (500, 300))
+    assert engine.run(600, 1 / 60) == 600
+    distance = shape.body.position.get_distance(engine.GAME_CENTER)
+    assert 50 < distance < 200
+
+
+def test_vectorized_gravity_matches_callback():
+    positions = [(500, 300), (400, 120), (250, 420)]
+    engines = [PhysicsEngine(world_size=(800, 600), vectorized_gravity=mode) for mode in (True, False)]
+    shapes = [[engine.create_circle(5, position) for position in positions] for engine in engines]
+    for shape in shapes[0] + shapes[1]:
+        shape.filter = pymunk.ShapeFilter(group=1)
+    for engine in engines:
+        engine.run(120, 1 / 120)
+    for vectorized, callback in zip(*shapes):
+        assert vectorized.body.position.get_distance(callback.body.position) < 1.0
+
+
+def test_remove_body_stops_gravity(engine):
+    shape = engine.create_circle(10, (500, 300))
+    engine.remove_body(shape.body)
+    assert engine.gravity_bodies == []
+    assert shape.body not in engine.space.bodies
+    engine.run(10, 1 / 60)
+
+
+def test_step_by_is_fixed_rate():
+    engines = [PhysicsEngine(world_size=(800, 600), step_rate=120) for _ in range(2)]
+    shapes = [engine.create_circle(10, (500, 300)) for engine in engines]
+    for _ in range(60):
+        engines[0].step_by(1 / 60)
+    for _ in range(30):
+        engines[1].step_by(1 / 30)
+    assert shapes[0].body.position == shapes[1].body.position
+
+
+def test_sync_interpolates_attached_assets(engine):
+    shape = engine.create_circle(10, (500, 300))
+    asset = Asset([], CIRCLE(10), pygame.Color('white'), (500, 300))
+    engine.attach(asset, shape.body)
+    alpha = engine.step_by(1.5 * engine.timestep.dt)
+    assert alpha == pytest.approx(0.5)
+    engine.sync(alpha)
+    previous, _ = engine.previous_state[shape.body]
+    expected = previous.interpolate_to(shape.body.position, 0.5)
+    assert asset.rect.center == pytest.approx(tuple(expected))
+
+
+def test_ring_is_one_body(engine):
+    quads = ring_quads(6, 50, 100)
+    ring_body, sides = engine.create_ring(quads, engine.GAME_CENTER, 0.5)
+    assert len(sides) == 6
+    assert engine.space.bodies == [ring_body]
+    assert all(side.body is ring_body for side in sides)
+    engine.run(60, 1 / 60)
+    assert ring_body.angle == pytest.approx(0.5)
+    assert ring_body.position == engine.GAME_CENTER
+
+
+def test_remove_side(engine):
+    ring_body, sides = engine.create_ring(ring_quads(3, 50, 100), engine.GAME_CENTER, 0)
+    for side in sides[:-1]:
+        engine.remove_side(side)
+    assert ring_body in engine.space.bodies
+    assert len(engine.space.shapes) == 1
+    engine.remove_side(sides[-1])
+    assert engine.ring_bodies == []
+    assert engine.space.bodies == []
+
+
+def test_frozen_ring_stops_and_thaws(engine):
+    ring_body, _ = engine.create_ring(ring_quads(4, 50, 100), engine.GAME_CENTER, 0.5)
+    engine.freeze_ring(ring_body, 1.0)
+    assert engine.is_frozen(ring_body)
+    assert ring_body.body_type == pymunk.Body.STATIC
+    engine.run(30, 1 / 60)
+    assert ring_body.angle == 0
+    engine.run(30, 1 / 60)
+    assert not engine.is_frozen(ring_body)
+    assert ring_body.body_type == pymunk.Body.KINEMATIC
+    assert ring_body.angular_velocity == pytest.approx(0.5)
+    engine.run(60, 1 / 60)
+    assert ring_body.angle == pytest.approx(0.5)
+
+
+def test_removing_frozen_ring_thaws_it(engine):
+    ring_body, _ = engine.create_ring(ring_quads(4, 50, 100), engine.GAME_CENTER, 0.5)
+    engine.freeze_ring(ring_body, 10)
+    engine.remove_ring(ring_body)
+    assert engine.frozen == {}
+    assert ring_body.body_type == pymunk.Body.KINEMATIC
+    assert ring_body.angular_velocity == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize('vectorized_gravity', [True, False])
+def test_resting_bodies_fall_asleep(vectorized_gravity):
+    engine = PhysicsEngine(world_size=(800, 600), vectorized_gravity=vectorized_gravity,
+                           idle_speed_threshold=5, sleep_time_threshold=0.5)
+    # A ball pulled onto a static planet, with nowhere to go
+    planet = pymunk.Circle(engine.space.static_body, 50, tuple(engine.GAME_CENTER))
+    planet.friction = 1
+    engine.space.add(planet)
+    body = engine.create_circle(10, (engine.GAME_CENTER.x + 60, engine.GAME_CENTER.y)).body
+    body.velocity = (0, 0)
+    body.angular_velocity = 0
+    engine.run(300, 1 / 60)
+    assert body.is_sleeping
+
+
+def test_refreezing_moves_the_thaw_time(engine):
+    ring_body, _ = engine.create_ring(ring_quads(4, 50, 100), engine.GAME_CENTER, 0.5)
+    engine.freeze_ring(ring_body, 1.0)
+    engine.run(30, 1 / 60)
+    engine.freeze_ring(ring_body, 1.0)
+    assert engine.get_frozen_time(ring_body) == pytest.approx(1.0)
+    assert len(engine.timers) == 1
+    engine.run(45, 1 / 60)
+    assert engine.is_frozen(ring_body)
@@ -0,0 +1,78 @@
+import math
+import time
+
+import pymunk
+import pytest
+
+from asset.geometry import ring_quads
+from physics import PhysicsEngine
+from physicsthread import PhysicsThread, StateSnapshot
+
+
+@pytest.fixture
+def engine():
+    engine = PhysicsEngine(world_size=(800, 600))
+    engine.create_ring(ring_quads(4, 50, 100), engine.GAME_CENTER, 1.0)
+    return engine
+
+
+def test_snapshot_flips_between_two_buffers():
+    snapshot = StateSnapshot(capacity=1)
+    body = pymunk.Body()
+    snapshot.get_back(1)[:] = [0, 0, 0, 1, 2, 3]
+    snapshot.publish({body: 0}, 1, 5.0)
+    front = snapshot.front
+    snapshot.get_back(3)[0] = [1, 2, 3, 4, 5, 6]
+    assert snapshot.front == front  # writing the back buffer doesn't touch the front one
+    rows, states, step_time, _ = snapshot.read()
+    assert rows == {body: 0}
+    assert states.tolist() == [[0, 0, 0, 1, 2, 3]]
+    assert step_time == 5.0
+    snapshot.publish({body: 0}, 1, 6.0)
+    assert snapshot.read()[1].tolist() == [[1, 2, 3, 4, 5, 6]]
+    assert len(snapshot.buffers[snapshot.front]) == 6
+
+
+def test_step_publishes_before_and_after(engine):
+    thread = PhysicsThread(engine)
+    ring_body = engine.ring_bodies[0]
+    thread.step(engine.timestep.dt)
+    rows, states, _, _ = thread.snapshot.read()
+    _, _, before, _, _, after = states[rows[ring_body]]
+    assert after - before == pytest.approx(engine.timestep.dt)
+    assert after == pytest.approx(ring_body.angle)
+
+
+def test_timers_fire_on_the_callers_thread(engine):
+    thread = PhysicsThread(engine)
+    fired = []
+    engine.timers.schedule(0.01, fired.append, 'due')
+    for _ in range(3):
+        thread.step(engine.timestep.dt)
+    assert fired == []
+    assert thread.advance_timers() == 1
+    assert fired == ['due']
+    assert engine.timers.time == pytest.approx(3 * engine.timestep.dt)
+
+
+def test_sync_interpolates_since_the_last_step(engine):
+    thread = PhysicsThread(engine)
+    thread.step(engine.timestep.dt)
+    _, _, step_time, _ = thread.snapshot.read()
+    rows, states = thread.sync(now=step_time + engine.timestep.dt / 2)
+    assert states[rows[engine.ring_bodies[0]]][2] == pytest.approx(engine.timestep.dt / 2)
+    rows, states = thread.sync(now=step_time + 10)
+    assert states[rows[engine.ring_bodies[0]]][2] == pytest.approx(engine.timestep.dt)
+
+
+def test_worker_steps_at_the_fixed_rate(engine):
+    thread = PhysicsThread(engine)
+    thread.start()
+    assert thread.running
+    time.sleep(0.1)
+    with thread.lock:
+        angle = engine.ring_bodies[0].angle
+    thread.stop()
+    assert not thread.running
+    assert 0 < thread.steps <= math.ceil(0.1 * engine.timestep.rate) + 2
+    assert angle == pytest.approx(thread.steps * engine.timestep.dt)
@@ -0,0 +1,66 @@
+import csv
+import json
+import time
+
+import pygame
+import pytest
+
+from profiler import FrameProfiler, StartupTimer, PHASES, INPUT, DRAW
+
+
+def record(profiler, frames):
+    for _ in range(frames):
+        profiler.begin_frame()
+        profiler.lap(INPUT)
+        time.sleep(0.001)
+        profiler.lap(DRAW)
+        profiler.end_frame()
+
+
+def test_history_is_a_ring_buffer():
+    profiler = FrameProfiler(history=4)
+    record(profiler, 6)
+    assert profiler.frames == 6
+    assert profiler.get_samples_ms().shape == (4, len(PHASES))
+
+
+def test_report_percentiles():
+    profiler = FrameProfiler()
+    record(profiler, 5)
+    report = profiler.report()
+    assert set(report) == set(PHASES) | {'frame'}
+    assert report['draw']['p50'] >= 1.0
+    assert report['draw']['p50'] <= report['draw']['p99']
+    assert report['flip']['p99'] == 0
+
+
+@pytest.mark.parametrize('extension', ['csv', 'json'])
+def test_export(tmp_path, extension):
+    profiler = FrameProfiler()
+    record(profiler, 3)
+    filename = str(tmp_path / f'frames.{extension}')
+    profiler.export(filename)
+    with open(filename) as exported:
+        if extension == 'csv':
+            rows = list(csv.reader(exported))
+            assert rows[0] == list(PHASES)
+            assert len(rows) == 4
+        else:
+            assert json.load(exported)['frames'] == 3
+
+
+def test_overlay_reports_its_rect():
+    pygame.font.init()
+    profiler = FrameProfiler()
+    record(profiler, 2)
+    surface = pygame.Surface((400, 300))
+    rect = profiler.draw_overlay(surface, pygame.font.Font(None, 20))
+    assert rect.width > 0 and rect.height > 0
+
+
+def test_startup_timer_phases_add_up():
+    timer = StartupTimer(start=0)
+    timer.mark('imports', 2_000_000)
+    timer.mark('display', 5_000_000)
+    timer.mark('imports', 6_000_000)
+    assert timer.report() == {'imports': 3.0, 'display': 3.0, 'total': 6.0}
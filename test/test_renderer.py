@@ -0,0 +1,73 @@
+import os
+
+import pytest
+import pygame
+from pygame import Surface, Rect
+
+from renderer import DirtyRectRenderer
+
+
+@pytest.fixture
+def renderer():
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    screen = pygame.display.set_mode((400, 300))
+    background = Surface(screen.get_size())
+    background.fill((10, 10, 10))
+    return DirtyRectRenderer(screen, background)
+
+
+def draw_box(renderer, key, rect):
+    renderer.screen.fill((255, 255, 255), rect)
+    renderer.mark(key, rect)
+
+
+def test_first_frame_flips(renderer):
+    renderer.erase()
+    draw_box(renderer, 'box', Rect(10, 10, 20, 20))
+    assert renderer.present() == [renderer.screen_rect]
+    assert renderer.flips == 1
+
+
+def test_moving_box_updates_old_and_new_rects(renderer):
+    renderer.erase()
+    draw_box(renderer, 'box', Rect(10, 10, 20, 20))
+    renderer.present()
+
+    renderer.erase()
+    assert renderer.screen.get_at((15, 15)) == (10, 10, 10)
+    draw_box(renderer, 'box', Rect(100, 100, 20, 20))
+    dirty = renderer.present()
+    assert renderer.partial_updates == 1
+    assert Rect(9, 9, 22, 22) in dirty
+    assert Rect(99, 99, 22, 22) in dirty
+
+
+def test_large_dirty_area_falls_back_to_flip(renderer):
+    renderer.erase()
+    renderer.present()
+    renderer.erase()
+    draw_box(renderer, 'big', Rect(0, 0, 400, 200))
+    assert renderer.present() == [renderer.screen_rect]
+    assert renderer.flips == 2
+
+
+def test_static_layer_is_only_redrawn_where_needed(renderer):
+    layer = Surface((50, 50))
+    layer.fill((0, 200, 0))
+    areas = [(layer, Rect(300, 10, 50, 50), Rect(0, 0, 50, 50))]
+    renderer.erase()
+    renderer.draw_layer('hud', areas, [])
+    renderer.present()
+
+    # A sprite passing under the layer gets the layer drawn back over it
+    renderer.erase()
+    draw_box(renderer, 'box', Rect(290, 20, 20, 20))
+    renderer.draw_layer('hud', areas, [])
+    assert renderer.screen.get_at((305, 25)) == (0, 200, 0)
+    assert renderer.screen.get_at((295, 25)) == (255, 255, 255)
+    assert Rect(300, 10, 50, 50) not in renderer.present()
+
+    renderer.erase()
+    renderer.draw_layer('hud', areas, [Rect(300, 10, 50, 50)])
+    assert Rect(300, 10, 50, 50).inflate(2, 2) in renderer.present()
@@ -0,0 +1,56 @@
+import struct
+
+import pygame
+import pytest
+from pygame.event import Event
+
+from replay import InputRecorder, InputReplayer, RECORD
+
+
+@pytest.fixture
+def log(tmp_path):
+    filename = str(tmp_path / 'session.pbr')
+    recorder = InputRecorder(filename, seed=1234)
+    recorder.record_frame(0, 1 / 60)
+    recorder.record_event(0, Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    recorder.record_event(0, Event(pygame.MOUSEMOTION, pos=(10, 20), rel=(1, 1), buttons=(0, 0, 0)))
+    recorder.record_frame(1, 0.02)
+    recorder.record_event(1, Event(pygame.MOUSEBUTTONUP, button=1, pos=(30, 40)))
+    recorder.record_event(1, Event(pygame.WINDOWFOCUSLOST))
+    recorder.record_frame(2, 0.0)
+    recorder.record_event(2, Event(pygame.QUIT))
+    recorder.close()
+    return filename
+
+
+def test_round_trip(log):
+    replayer = InputReplayer(log)
+    assert replayer.seed == 1234
+    assert replayer.frames == 3
+    assert replayer.get_dt(0) == pytest.approx(1 / 60, abs=1e-6)
+    assert [(event.type, event.key) for event in replayer.get_events(0)[:1]] == [(pygame.KEYDOWN, pygame.K_SPACE)]
+    assert replayer.get_events(0)[1].pos == (10, 20)
+    up, = replayer.get_events(1)
+    assert (up.type, up.button, up.pos) == (pygame.MOUSEBUTTONUP, 1, (30, 40))
+    assert replayer.get_events(2)[0].type == pygame.QUIT
+    assert replayer.is_finished(3)
+
+
+def test_truncated_log_still_loads(log):
+    with open(log, 'r+b') as log_file:
+        log_file.truncate(log_file.seek(0, 2) - RECORD.size // 2)
+    assert InputReplayer(log).get_events(2) == []
+
+
+def test_rejects_other_files(tmp_path):
+    filename = tmp_path / 'not_a_log'
+    filename.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        InputReplayer(str(filename))
+
+
+def test_out_of_range_seed_fails_before_opening(tmp_path):
+    path = tmp_path / 'game.log'
+    with pytest.raises(struct.error):
+        InputRecorder(str(path), -1)
+    assert not path.exists()
@@ -0,0 +1,133 @@
+import pygame
+import pytest
+from pygame import Color
+
+from physics import PhysicsEngine
+from ring import RingStream, RING_SIZE, WALL_THICKNESS
+
+COLORS = [Color('red'), Color('green'), Color('blue')]
+
+
+@pytest.fixture
+def engine():
+    return PhysicsEngine(world_size=(2000, 2000))
+
+
+def ball_at(engine, distance):
+    return engine.GAME_CENTER + (distance, 0)
+
+
+def test_starts_with_the_band_around_the_center(engine):
+    stream = RingStream(engine, COLORS, seed=0, ahead=3)
+    stream.update(engine.GAME_CENTER)
+    assert sorted(stream.rings) == [0, 1, 2]
+    assert len(engine.ring_bodies) == 3
+
+
+def test_breaking_outward_culls_and_reuses(engine):
+    stream = RingStream(engine, COLORS, seed=0, min_sides=4, max_sides=4, ahead=3, behind=1)
+    for ring in range(50):
+        stream.update(ball_at(engine, RING_SIZE.INNER.value + ring * WALL_THICKNESS + 1))
+        assert len(engine.ring_bodies) <= 4
+        assert len(engine.space.bodies) <= 4
+    assert max(stream.rings) == 52
+    assert stream.created <= 5
+    assert stream.reused >= 45
+
+
+def test_reused_ring_has_new_geometry(engine):
+    stream = RingStream(engine, COLORS, seed=0, min_sides=5, max_sides=5, ahead=1, behind=0)
+    stream.update(engine.GAME_CENTER)
+    body = stream.rings[0].body
+    side = stream.rings[0].sides[0]
+    stream.remove_side(side)
+    engine.run(1, 1 / 120)
+    stream.update(ball_at(engine, RING_SIZE.INNER.value + 1))
+    assert stream.rings[1].body is body
+    assert side.space is engine.space
+    assert max(vertex.length for vertex in side.get_vertices()) == pytest.approx(RingStream.get_outer_radius(1))
+
+
+def test_side_sprites_are_pooled(engine):
+    group = pygame.sprite.Group()
+    stream = RingStream(engine, COLORS, groups=[group], seed=0, min_sides=3, max_sides=3, ahead=1, behind=0)
+    stream.update(engine.GAME_CENTER)
+    sprites = set(group.sprites())
+    assert len(sprites) == 3
+    stream.update(ball_at(engine, RING_SIZE.INNER.value + 1))
+    assert set(group.sprites()) == sprites
+    stream.sync()
+
+
+def test_next_ring_is_the_one_around_the_ball(engine):
+    stream = RingStream(engine, COLORS, seed=0, ahead=3, behind=1)
+    stream.update(ball_at(engine, 0))
+    assert stream.get_next_ring(ball_at(engine, 0)).index == 0
+    assert stream.get_next_ring(ball_at(engine, RING_SIZE.INNER.value + 1)).index == 1
+
+
+def test_delayed_side_removal(engine):
+    stream = RingStream(engine, COLORS, seed=0, ahead=3, behind=1)
+    stream.update(ball_at(engine, 0))
+    side = stream.rings[0].sides[0]
+    stream.remove_side(side, delay=0.5)
+    engine.run(30, 1 / 60)
+    assert side.space is not None
+    engine.run(31, 1 / 60)
+    assert side.space is None
+
+
+def test_culling_cancels_pending_removals(engine):
+    stream = RingStream(engine, COLORS, seed=0, ahead=3, behind=1)
+    stream.update(ball_at(engine, 0))
+    stream.remove_side(stream.rings[0].sides[0], delay=1)
+    stream.cull(0)
+    assert len(engine.timers) == 0
+
+
+def test_sync_from_a_snapshot_matches_the_bodies(engine):
+    stream = RingStream(engine, COLORS, seed=0, ahead=2)
+    stream.update(engine.GAME_CENTER)
+    engine.run(10, 1 / 60)
+    stream.sync()
+    expected = [xy for ring in stream.rings.values() for asset in ring.assets for xy in asset.position]
+    rows = {ring.body: i for i, ring in enumerate(stream.rings.values())}
+    states = [[*ring.body.position, ring.body.angle] for ring in stream.rings.values()]
+    stream.sync(rows=rows, states=states)
+    synced = [xy for ring in stream.rings.values() for asset in ring.assets for xy in asset.position]
+    assert synced == pytest.approx(expected)
+
+
+def test_sync_interpolates_ring_angles(engine):
+    stream = RingStream(engine, COLORS, groups=[pygame.sprite.Group()], seed=0, ahead=1)
+    stream.update(engine.GAME_CENTER)
+    ring = next(iter(stream.rings.values()))
+    engine.step_by(engine.timestep.dt)
+    start, end = engine.previous_state[ring.body][1], ring.body.angle
+    assert end != start
+    for alpha, angle in ((0.5, (start + end) / 2), (1.0, end)):
+        stream.sync(alpha)
+        expected = ring.body.position + ring.pivots[0].rotated(angle)
+        assert ring.assets[0].position == pytest.approx([expected.x, expected.y])
+
+
+def test_respawned_ring_ignores_the_snapshot_of_its_old_ring(engine):
+    from physicsthread import PhysicsThread
+    thread = PhysicsThread(engine)
+    stream = RingStream(engine, COLORS, groups=[pygame.sprite.Group()], seed=0,
+                        min_sides=4, max_sides=4, ahead=1, behind=0)
+    stream.update(engine.GAME_CENTER)
+    body = stream.rings[0].body
+    for _ in range(30):
+        thread.step(engine.timestep.dt)
+    # Culled and reused for the next ring before the worker steps again
+    stream.update(ball_at(engine, RING_SIZE.INNER.value + 1))
+    assert stream.rings[1].body is body
+    spawned = [list(asset.position) for asset in stream.rings[1].assets]
+    rows, states = thread.sync()
+    assert body not in rows
+    stream.sync(rows=rows, states=states)
+    assert [list(asset.position) for asset in stream.rings[1].assets] == spawned
+    thread.step(engine.timestep.dt)
+    rows, _ = thread.sync()
+    assert body in rows
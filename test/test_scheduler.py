@@ -0,0 +1,80 @@
+import random
+
+from scheduler import TimerScheduler
+
+
+def test_timers_fire_in_deadline_order():
+    timers = TimerScheduler()
+    fired = []
+    for delay in (3, 1, 2):
+        timers.schedule(delay, fired.append, delay)
+    assert timers.advance(1.5) == 1
+    assert fired == [1]
+    timers.advance(5)
+    assert fired == [1, 2, 3]
+    assert len(timers) == 0
+
+
+def test_cancel_and_reschedule():
+    timers = TimerScheduler()
+    fired = []
+    first = timers.schedule(1, fired.append, 'first')
+    second = timers.schedule(1, fired.append, 'second')
+    timers.cancel(first)
+    timers.reschedule(second, 3)
+    assert len(timers) == 1
+    timers.advance(2)
+    assert fired == []
+    assert timers.get_remaining(second) == 1
+    timers.advance(1)
+    assert fired == ['second']
+    assert not second.active
+    assert timers.get_remaining(second) == 0
+
+
+def test_callbacks_can_schedule_more():
+    timers = TimerScheduler()
+    fired = []
+    timers.schedule(1, lambda: timers.schedule(0, fired.append, 'chained'))
+    timers.advance(1)
+    assert fired == ['chained']
+
+
+def test_thousands_of_timers():
+    timers = TimerScheduler()
+    rng = random.Random(0)
+    fired = []
+    for i in range(5000):
+        timers.schedule(rng.uniform(0, 10), fired.append, i)
+    for timer in list(timers.heap)[::2]:
+        timers.cancel(timer[2])
+    while len(timers):
+        timers.advance(1 / 120)
+    assert len(fired) == 2500
+
+
+def test_cancelled_entries_do_not_pile_up():
+    timers = TimerScheduler()
+    for _ in range(1000):
+        timers.cancel(timers.schedule(100, None))
+    assert len(timers.heap) <= 64
+
+
+def test_callback_can_cancel_many_and_schedule_more():
+    timers = TimerScheduler()
+    fired = []
+    doomed = [timers.schedule(10, fired.append, 'doomed') for _ in range(200)]
+    survivor = timers.schedule(5, fired.append, 'survivor')
+
+    def cancel_all():
+        for timer in doomed:
+            timers.cancel(timer)
+        timers.schedule(0, fired.append, 'now')
+    timers.schedule(1, cancel_all)
+    timers.advance(1)
+    assert fired == ['now']
+    assert len(timers.heap) < 200
+    timers.advance(10)
+    assert fired == ['now', 'survivor']
+    assert len(timers) == 0
+    assert not survivor.active
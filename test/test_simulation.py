@@ -0,0 +1,35 @@
+import pytest
+
+from simulation import LevelSimulation
+from sweep import sweep
+
+LEVEL = {'Rings': [3, 4], 'Hits': [1, 2], 'Speeds': [10, 12]}
+
+
+def test_level_builds_one_body_per_ring():
+    simulation = LevelSimulation(LEVEL, seed=0)
+    assert len(simulation.ring_bodies) == 2
+    assert len(simulation.side_colors) == 7
+    assert simulation.ball_color in simulation.side_colors.values()
+
+
+def test_run_is_deterministic_and_clears():
+    first = LevelSimulation(LEVEL, seed=3).run(max_time=60)
+    second = LevelSimulation(LEVEL, seed=3).run(max_time=60)
+    assert first == second
+    assert first['cleared']
+    assert first['hits'] >= 3
+
+
+def test_missing_hits_and_speeds_use_defaults():
+    simulation = LevelSimulation({'Rings': [3, 3, 3, 3]}, seed=0)
+    assert set(simulation.hits_left.values()) == {1}
+    assert len(simulation.ring_bodies) == 4
+
+
+def test_sweep_aggregates_per_level():
+    report = sweep({'easy': LEVEL}, runs=2, max_time=30, workers=2)
+    summary = report['levels']['easy']
+    assert summary['runs'] == 2
+    assert summary['cleared_fraction'] == pytest.approx(1.0)
+    assert summary['steps_per_second_mean'] > 0
@@ -0,0 +1,30 @@
+import pytest
+
+from timestep import FixedTimestep
+
+
+def test_whole_frames_step_exactly():
+    timestep = FixedTimestep(rate=120)
+    assert [timestep.advance(1 / 60) for _ in range(100)] == [2] * 100
+    assert timestep.alpha == pytest.approx(0.0, abs=1e-6)
+
+
+def test_partial_step_carries_over():
+    timestep = FixedTimestep(rate=100)
+    assert timestep.advance(0.015) == 1
+    assert timestep.alpha == pytest.approx(0.5)
+    assert timestep.advance(0.005) == 1
+    assert timestep.alpha == pytest.approx(0.0, abs=1e-6)
+
+
+def test_spike_is_capped():
+    timestep = FixedTimestep(rate=100, max_steps=5)
+    assert timestep.advance(1.0) == 5
+    assert timestep.dropped_time == pytest.approx(0.95)
+    assert timestep.accumulator < timestep.dt
+
+
+def test_negative_frame_time_is_ignored():
+    timestep = FixedTimestep()
+    assert timestep.advance(-1.0) == 0
+    assert timestep.accumulator == 0.0
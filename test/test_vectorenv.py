@@ -0,0 +1,35 @@
+import numpy as np
+
+from vectorenv import VectorEnv
+
+LEVEL = {'Rings': [3, 4], 'Hits': [1, 1], 'Speeds': [10, 12]}
+
+
+def test_observation_shapes_and_buffers():
+    env = VectorEnv(LEVEL, num_envs=3)
+    positions, velocities, angles, alive, cleared = env.reset()
+    assert positions.shape == (3, 2)
+    assert angles.shape == (3, 2)
+    assert alive.shape == (3, 7) and alive.all()
+    assert not cleared.any()
+    assert env.step(np.zeros((3, 2)))[0] is positions
+
+
+def test_worlds_are_independent():
+    env = VectorEnv(LEVEL, num_envs=2)
+    actions = np.array([[0.0, 400.0], [0.0, 0.0]])
+    positions, velocities, *_ = env.step(actions)
+    assert velocities[0, 0] > 0
+    assert (velocities[1] == 0).all()
+    for _ in range(60):
+        positions, *_ = env.step(np.zeros((2, 2)))
+    assert positions[0, 0] != positions[1, 0]
+
+
+def test_partial_reset():
+    env = VectorEnv(LEVEL, num_envs=2)
+    env.step(np.array([[0.0, 400.0], [0.0, 400.0]]))
+    first = env.simulations[0]
+    env.reset(np.array([False, True]))
+    assert env.simulations[0] is first
+    assert list(env.resets) == [0, 1]